@@ -1,18 +1,27 @@
+import asyncio
 import json
 import logging
-from pathlib import Path
 from typing import Optional
 import fitz  # PyMuPDF
 import ollama
 from core.models import AnalysisResult
-from core.db import tax_schemes, pending_updates
+from core.catalog import DEFAULT_JURISDICTION, get_catalog, get_rate
+from core.db import pending_updates
+from core.evidence import get_evidence_store
+from core.summary import invalidate_summary
 from datetime import datetime
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
-logger = logging.getLogger(__name__)
+try:
+    from config import OLLAMA_MODEL, OLLAMA_BASE_URL, OLLAMA_KEEP_ALIVE, OLLAMA_TIMEOUT
+except ImportError:
+    OLLAMA_MODEL = "llama2"  # or "llama2:13b" for more accuracy
+    OLLAMA_BASE_URL = "http://localhost:11434"
+    OLLAMA_KEEP_ALIVE = "30m"
+    OLLAMA_TIMEOUT = 300
 
-EVIDENCE_DIR = Path(__file__).parent.parent / "evidence"
-OLLAMA_MODEL = "llama2"  # or "llama2:13b" for more accuracy
-OLLAMA_BASE_URL = "http://localhost:11434"
+logger = logging.getLogger(__name__)
 
 
 def extract_pdf_text(pdf_path: str) -> str:
@@ -30,119 +39,263 @@ def extract_pdf_text(pdf_path: str) -> str:
         return ""
 
 
-def analyze_document(pdf_path: str) -> Optional[AnalysisResult]:
-    """
-    Analyze a PDF document using Ollama/Llama model.
-    
-    Args:
-        pdf_path: Path to the PDF file
-        
-    Returns:
-        AnalysisResult with change detection info
-    """
-    try:
-        # Extract text from PDF
-        pdf_text = extract_pdf_text(pdf_path)
-        if not pdf_text:
-            logger.warning(f"No text extracted from {pdf_path}")
-            return None
-        
-        # Get current database values
-        db_items = list(tax_schemes.find())
-        db_context = "\n".join([
-            f"- {item['item_name']}: {item['tax_percentage']}%"
-            for item in db_items
-        ])
-        
-        # Prepare prompt for Ollama
-        system_prompt = """You are a Tax Auditor. I will provide current database values and a new document text. 
+SYSTEM_PROMPT = """You are a Tax Auditor. I will provide current database values and a new document text. 
 If the tax percentage for an item has changed, return ONLY valid JSON: 
 { "change_detected": true, "item": "item_name", "new_val": 12.0, "quote": "exact text from doc" }
 If no change, return ONLY:
 { "change_detected": false }
 Do not include any other text. Return ONLY the JSON."""
-        
-        user_prompt = f"""Current Database Values:
+
+
+def build_user_prompt(pdf_text: str, jurisdiction: str = DEFAULT_JURISDICTION) -> str:
+    """Build the analysis prompt from the document's jurisdiction catalog and its text."""
+    db_context = "\n".join([
+        f"- {item_name}: {rate}%"
+        for item_name, rate in get_catalog(jurisdiction).items()
+    ])
+
+    return f"""Current Database Values:
 {db_context}
 
 New Document Text:
 {pdf_text}
 
 Analyze and detect any tax percentage changes."""
-        
-        # Call Ollama/Llama
-        logger.info(f"Analyzing document: {pdf_path}")
-        response = ollama.generate(
+
+
+def parse_analysis_json(response_text: str) -> Optional[AnalysisResult]:
+    """Parse the model response into an AnalysisResult, without storing anything."""
+    logger.info(f"Ollama Response: {response_text}")
+
+    # Extract JSON from response
+    try:
+        # Try to find JSON in the response
+        json_start = response_text.find("{")
+        json_end = response_text.rfind("}") + 1
+        if json_start != -1 and json_end > json_start:
+            json_str = response_text[json_start:json_end]
+            result_data = json.loads(json_str)
+        else:
+            result_data = json.loads(response_text)
+    except json.JSONDecodeError as e:
+        logger.error(f"Failed to parse JSON response: {response_text}, Error: {e}")
+        return None
+
+    result = AnalysisResult(**result_data)
+    if result.change_detected and not (result.item and result.new_val is not None and (result.quote or "").strip()):
+        # Without a quote the change can be neither reviewed nor highlighted
+        logger.error(f"Change reported without item, new value or quote: {response_text}")
+        return None
+    return result
+
+
+def parse_analysis_response(
+    document_key: str,
+    response_text: str,
+    jurisdiction: str = DEFAULT_JURISDICTION,
+) -> Optional[AnalysisResult]:
+    """
+    Parse the model response and store a pending update if a change was detected.
+
+    Args:
+        document_key: Evidence store key of the analyzed PDF
+        response_text: Raw text returned by the model
+        jurisdiction: Jurisdiction whose catalog the document was compared with
+
+    Returns:
+        AnalysisResult with change detection info, with `update_id` set to the
+        pending update created for a detected change
+    """
+    result = parse_analysis_json(response_text)
+
+    # If change detected, store in pending_updates
+    if result and result.change_detected:
+        logger.info(f"Change detected: {result.item} -> {result.new_val}")
+        result.update_id = store_pending_update(
+            detected_item=result.item,
+            new_web_val=result.new_val,
+            evidence_pdf_path=document_key,
+            evidence_quote=result.quote,
+            evidence_blob=document_key,
+            jurisdiction=jurisdiction,
+        )
+
+    return result
+
+
+def analyze_text(
+    document_key: str,
+    pdf_text: str,
+    jurisdiction: str = DEFAULT_JURISDICTION,
+) -> Optional[AnalysisResult]:
+    """
+    Analyze already extracted document text using Ollama/Llama model.
+
+    Args:
+        document_key: Evidence store key of the PDF the text was extracted from
+        pdf_text: Extracted document text
+        jurisdiction: Jurisdiction whose catalog the document is compared with
+
+    Returns:
+        AnalysisResult with change detection info
+    """
+    try:
+        logger.info(f"Analyzing document: {document_key}")
+        response = ollama.Client(host=OLLAMA_BASE_URL, timeout=OLLAMA_TIMEOUT).generate(
             model=OLLAMA_MODEL,
-            prompt=user_prompt,
-            system=system_prompt,
+            prompt=build_user_prompt(pdf_text, jurisdiction),
+            system=SYSTEM_PROMPT,
             stream=False,
+            keep_alive=OLLAMA_KEEP_ALIVE,
         )
-        
-        # Parse response
-        response_text = response.get("response", "").strip()
-        logger.info(f"Ollama Response: {response_text}")
-        
-        # Extract JSON from response
-        try:
-            # Try to find JSON in the response
-            json_start = response_text.find("{")
-            json_end = response_text.rfind("}") + 1
-            if json_start != -1 and json_end > json_start:
-                json_str = response_text[json_start:json_end]
-                result_data = json.loads(json_str)
-            else:
-                result_data = json.loads(response_text)
-            
-            result = AnalysisResult(**result_data)
-            
-            # If change detected, store in pending_updates
-            if result.change_detected:
-                logger.info(f"Change detected: {result.item} -> {result.new_val}")
-                store_pending_update(
-                    detected_item=result.item,
-                    new_web_val=result.new_val,
-                    evidence_pdf_path=pdf_path,
-                    evidence_quote=result.quote
-                )
-            
-            return result
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON response: {response_text}, Error: {e}")
-            return None
-            
+        return parse_analysis_response(document_key, response.get("response", "").strip(), jurisdiction)
+    except Exception as e:
+        logger.error(f"Error analyzing document {document_key}: {e}")
+        return None
+
+
+async def analyze_text_async(
+    document_key: str,
+    pdf_text: str,
+    jurisdiction: str = DEFAULT_JURISDICTION,
+) -> Optional[AnalysisResult]:
+    """
+    Async variant of `analyze_text` for running several model calls concurrently.
+
+    Database reads and writes are pushed to a worker thread so they do not
+    block the event loop.
+    """
+    try:
+        logger.info(f"Analyzing document: {document_key}")
+        response_text = await generate_analysis_async(pdf_text, jurisdiction)
+        return await asyncio.to_thread(parse_analysis_response, document_key, response_text, jurisdiction)
     except Exception as e:
-        logger.error(f"Error analyzing document {pdf_path}: {e}")
+        logger.error(f"Error analyzing document {document_key}: {e}")
+        return None
+
+
+async def generate_analysis_async(pdf_text: str, jurisdiction: str = DEFAULT_JURISDICTION) -> str:
+    """Ask the model to compare document text with a jurisdiction's catalog; returns its raw response."""
+    user_prompt = await asyncio.to_thread(build_user_prompt, pdf_text, jurisdiction)
+    response = await ollama.AsyncClient(host=OLLAMA_BASE_URL, timeout=OLLAMA_TIMEOUT).generate(
+        model=OLLAMA_MODEL,
+        prompt=user_prompt,
+        system=SYSTEM_PROMPT,
+        stream=False,
+        # Every request resets how long the model stays loaded, so pass it on each call
+        keep_alive=OLLAMA_KEEP_ALIVE,
+    )
+    return response.get("response", "").strip()
+
+
+def analyze_document(pdf_path: str, jurisdiction: str = DEFAULT_JURISDICTION) -> Optional[AnalysisResult]:
+    """
+    Analyze a PDF document using Ollama/Llama model.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        jurisdiction: Jurisdiction whose catalog the document is compared with
+        
+    Returns:
+        AnalysisResult with change detection info
+    """
+    # Extract text from PDF
+    pdf_text = extract_pdf_text(pdf_path)
+    if not pdf_text:
+        logger.warning(f"No text extracted from {pdf_path}")
         return None
 
+    # Register the document so updates reference it by content hash
+    document_key = get_evidence_store().put_file(pdf_path)
+    return analyze_text(document_key, pdf_text, jurisdiction)
+
+
+def pending_update_key(
+    detected_item: str,
+    new_web_val: float,
+    evidence_blob: Optional[str],
+    jurisdiction: str = DEFAULT_JURISDICTION,
+) -> dict:
+    """
+    Natural key of a pending update: the same item and rate of one jurisdiction
+    detected in the same document.
+
+    Enforced by the unique partial index `pending_natural_key` on pending updates.
+    """
+    return {
+        "jurisdiction": jurisdiction,
+        "detected_item": detected_item,
+        "new_web_val": new_web_val,
+        "evidence_blob": evidence_blob,
+        "status": "pending",
+    }
+
+
+def pending_update_upsert(
+    detected_item: str,
+    new_web_val: float,
+    evidence_pdf_path: str,
+    evidence_quote: str,
+    evidence_blob: Optional[str] = None,
+    jurisdiction: str = DEFAULT_JURISDICTION,
+) -> tuple[dict, dict]:
+    """
+    Filter and update document of an upsert that creates a pending update
+    unless one with the same natural key already exists.
+    """
+    # Find current value in the jurisdiction's catalog
+    current_db_val = get_rate(detected_item, jurisdiction)
+
+    return (
+        pending_update_key(detected_item, new_web_val, evidence_blob, jurisdiction),
+        {
+            "$setOnInsert": {
+                "current_db_val": current_db_val,
+                "evidence_pdf_path": evidence_pdf_path,
+                "evidence_quote": evidence_quote,
+                "created_at": datetime.now(),
+                "updated_at": datetime.now(),
+            }
+        },
+    )
+
 
 def store_pending_update(
     detected_item: str,
     new_web_val: float,
     evidence_pdf_path: str,
-    evidence_quote: str
+    evidence_quote: str,
+    evidence_blob: Optional[str] = None,
+    jurisdiction: str = DEFAULT_JURISDICTION,
 ) -> str:
-    """Store a pending update in the database."""
+    """
+    Store a pending update in the database.
+
+    Repeated detections of the same item and rate in the same document return
+    the existing pending update instead of creating a duplicate.
+    """
     try:
-        # Find current value in database
-        current_item = tax_schemes.find_one({"item_name": detected_item})
-        current_db_val = current_item["tax_percentage"] if current_item else None
-        
-        # Create pending update record
-        update_record = {
-            "detected_item": detected_item,
-            "current_db_val": current_db_val,
-            "new_web_val": new_web_val,
-            "evidence_pdf_path": evidence_pdf_path,
-            "evidence_quote": evidence_quote,
-            "status": "pending",
-            "created_at": datetime.now(),
-            "updated_at": datetime.now(),
-        }
-        
-        result = pending_updates.insert_one(update_record)
-        logger.info(f"Pending update stored with ID: {result.inserted_id}")
-        return str(result.inserted_id)
+        query, update = pending_update_upsert(
+            detected_item, new_web_val, evidence_pdf_path, evidence_quote, evidence_blob, jurisdiction
+        )
+        for attempt in range(2):
+            try:
+                result = pending_updates.find_one_and_update(
+                    query,
+                    update,
+                    upsert=True,
+                    projection={"_id": 1},
+                    return_document=ReturnDocument.AFTER,
+                )
+                break
+            except DuplicateKeyError:
+                # A concurrent worker inserted the same update first; the retry matches it
+                if attempt:
+                    raise
+
+        invalidate_summary()
+        logger.info(f"Pending update stored with ID: {result['_id']}")
+        return str(result["_id"])
     except Exception as e:
         logger.error(f"Error storing pending update: {e}")
         return None
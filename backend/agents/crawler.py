@@ -1,89 +1,390 @@
 import asyncio
 import random
-from pathlib import Path
-from playwright.async_api import async_playwright
-from fake_useragent import UserAgent
+from typing import Literal, Optional
+from urllib.parse import urlsplit
+import httpx
 import logging
+from agents.frontier import (
+    CrawlFrontier,
+    extract_links,
+    is_pdf_url,
+    normalize_url,
+    parse_feed,
+    parse_sitemap,
+    sitemap_candidates,
+    unanalyzed_documents,
+)
+from core.evidence import get_evidence_store
+
+try:
+    from config import (
+        CRAWL_TIMEOUT,
+        CRAWL_MAX_DEPTH,
+        MAX_PDF_DOWNLOADS,
+        CRAWL_HTTP_MAX_CONNECTIONS,
+        JS_RENDERED_SOURCES,
+    )
+except ImportError:
+    CRAWL_TIMEOUT = 60000
+    CRAWL_MAX_DEPTH = 2
+    MAX_PDF_DOWNLOADS = 20
+    CRAWL_HTTP_MAX_CONNECTIONS = 10
+    JS_RENDERED_SOURCES = []
 
 logger = logging.getLogger(__name__)
 
-EVIDENCE_DIR = Path(__file__).parent.parent / "evidence" / "raw"
+LINK_KEYWORDS = ["tax", "amendment", "scheme", "regulation", "pdf"]
+MAX_SITEMAPS = 10
+
+CrawlMode = Literal["auto", "static", "browser"]
+
+
+def is_relevant(url: str, text: str = "") -> bool:
+    """Check if a link contains tax-related keywords."""
+    haystack = (text + url).lower()
+    return any(kw in haystack for kw in LINK_KEYWORDS)
+
+
+def conditional_headers(validators: Optional[dict]) -> dict:
+    """Request headers asking the server to answer 304 if a page is unchanged since it was recorded."""
+    validators = validators or {}
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def response_validators(headers) -> dict:
+    """ETag and Last-Modified of a response, for conditional requests on the next crawl."""
+    return {
+        field: headers.get(header)
+        for field, header in (("etag", "etag"), ("last_modified", "last-modified"))
+        if headers.get(header)
+    }
+
+
+def is_js_rendered(url: str) -> bool:
+    """Check whether a source is flagged in config as needing a browser to render."""
+    host = urlsplit(url).netloc.lower()
+    return any(host == source or host.endswith("." + source) for source in JS_RENDERED_SOURCES)
+
+
+class StaticFetcher:
+    """Fetch pages with a pooled async HTTP client, without running scripts."""
+
+    human_delays = False
+
+    async def __aenter__(self):
+        from fake_useragent import UserAgent
+
+        self.client = httpx.AsyncClient(
+            headers={"User-Agent": UserAgent().random},
+            timeout=CRAWL_TIMEOUT / 1000,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=CRAWL_HTTP_MAX_CONNECTIONS),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+
+    async def fetch_page(self, url: str, validators: Optional[dict] = None) -> tuple[str, Optional[str], dict]:
+        """
+        Returns (final URL after redirects, HTML, validators); HTML is None if
+        the server answered 304 to a conditional request with `validators`.
+        """
+        response = await self.client.get(url, headers=conditional_headers(validators))
+        if response.status_code == 304:
+            return str(response.url), None, validators
+        response.raise_for_status()
+        return str(response.url), response.text, response_validators(response.headers)
+
+    async def fetch_text(self, url: str) -> str:
+        try:
+            response = await self.client.get(url)
+            return response.text if response.is_success else ""
+        except httpx.HTTPError as e:
+            logger.debug(f"Failed to fetch {url}: {e}")
+            return ""
+
+    async def fetch_bytes(self, url: str) -> Optional[bytes]:
+        response = await self.client.get(url)
+        if not response.is_success:
+            logger.warning(f"Failed to download {url}: HTTP {response.status_code}")
+            return None
+        return response.content
+
 
+class BrowserFetcher:
+    """Fetch pages with headless Chromium for sources that render links with JavaScript."""
 
-async def crawl_and_download(url: str) -> list[str]:
+    human_delays = True
+
+    async def __aenter__(self):
+        from playwright.async_api import async_playwright
+        from fake_useragent import UserAgent
+
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(headless=True)
+        self.context = await self.browser.new_context(
+            user_agent=UserAgent().random,
+            viewport={"width": 1280, "height": 720}
+        )
+        self.page = await self.context.new_page()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.context.close()
+        await self.browser.close()
+        await self.playwright.stop()
+
+    async def fetch_page(self, url: str, validators: Optional[dict] = None) -> tuple[str, Optional[str], dict]:
+        """
+        Returns (final URL after redirects, rendered HTML, validators); HTML is
+        None if the server answered 304 to a conditional request with `validators`.
+        """
+        headers = conditional_headers(validators)
+        if headers:
+            # A plain conditional request first, so unchanged pages are not rendered
+            response = await self.context.request.get(url, headers=headers, timeout=CRAWL_TIMEOUT)
+            if response.status == 304:
+                return url, None, validators
+
+        response = await self.page.goto(url, wait_until="networkidle", timeout=CRAWL_TIMEOUT)
+        page_validators = response_validators(response.headers) if response else {}
+        return self.page.url, await self.page.content(), page_validators
+
+    async def fetch_text(self, url: str) -> str:
+        try:
+            response = await self.context.request.get(url, timeout=CRAWL_TIMEOUT)
+            return await response.text() if response.ok else ""
+        except Exception as e:
+            logger.debug(f"Failed to fetch {url}: {e}")
+            return ""
+
+    async def fetch_bytes(self, url: str) -> Optional[bytes]:
+        response = await self.context.request.get(url, timeout=CRAWL_TIMEOUT)
+        if not response.ok:
+            logger.warning(f"Failed to download {url}: HTTP {response.status}")
+            return None
+        return await response.body()
+
+
+async def discover_from_sitemaps(fetcher, frontier: CrawlFrontier) -> list[str]:
     """
-    Crawl a website and download PDF documents related to tax/amendments.
-    
-    Args:
-        url: Target URL to crawl
-        
+    Seed the frontier from robots.txt/sitemap.xml.
+
     Returns:
-        List of paths to downloaded PDFs
+        Relevant document URLs listed in the sitemaps
+    """
+    documents = []
+    robots_txt = await fetcher.fetch_text(normalize_url("/robots.txt", frontier.source))
+    pending = sitemap_candidates(robots_txt, frontier.source)
+    seen = set()
+    while pending and len(seen) < MAX_SITEMAPS:
+        sitemap_url = pending.pop(0)
+        if sitemap_url in seen:
+            continue
+        seen.add(sitemap_url)
+
+        urls, nested = parse_sitemap(await fetcher.fetch_text(sitemap_url))
+        pending.extend(nested)
+        for entry in urls:
+            entry_url = normalize_url(entry)
+            if entry_url and is_relevant(entry_url):
+                if is_pdf_url(entry_url):
+                    documents.append(entry_url)
+                else:
+                    frontier.add_page(entry_url, 1)
+    return documents
+
+
+async def discover_from_feeds(fetcher, frontier: CrawlFrontier, feeds: list[str], depth: int) -> list[str]:
+    """
+    Queue entries of RSS/Atom feeds linked from a page.
+
+    Returns:
+        Document URLs listed in the feeds
+    """
+    documents = []
+    for feed_url in feeds:
+        for entry in parse_feed(await fetcher.fetch_text(feed_url)):
+            entry_url = normalize_url(entry, feed_url)
+            if entry_url and is_pdf_url(entry_url):
+                documents.append(entry_url)
+            else:
+                frontier.add_page(entry_url, depth + 1)
+    return documents
+
+
+async def download_document(fetcher, frontier: CrawlFrontier, pdf_url: str) -> Optional[str]:
+    """Download a PDF into the evidence store and record it in the frontier."""
+    try:
+        logger.info(f"Downloading PDF: {pdf_url}")
+        content = await fetcher.fetch_bytes(pdf_url)
+        if content is None:
+            return None
+
+        key = await asyncio.to_thread(get_evidence_store().put_bytes, content)
+        frontier.record_document(pdf_url, key)
+        logger.info(f"Downloaded: {pdf_url} -> {key}")
+        return key
+    except Exception as e:
+        logger.warning(f"Failed to download {pdf_url}: {e}")
+        return None
+
+
+async def walk(fetcher, frontier: CrawlFrontier) -> tuple[list[str], bool]:
+    """
+    Walk the frontier with the given fetcher and download relevant PDFs.
+
+    Returns:
+        Tuple of (evidence keys of newly downloaded PDFs, whether any page yielded
+        relevant links, either now or on the crawl that recorded it unchanged)
     """
     downloaded_files = []
-    ua = UserAgent()
-    
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            user_agent=ua.random,
-            viewport={"width": 1280, "height": 720}
-        )
-        page = await context.new_page()
-        
+    document_urls = await discover_from_sitemaps(fetcher, frontier)
+    found_links = bool(document_urls) or len(frontier) > 1
+
+    while len(downloaded_files) < MAX_PDF_DOWNLOADS:
+        # Download documents found so far before expanding further
+        for pdf_url in document_urls:
+            if len(downloaded_files) >= MAX_PDF_DOWNLOADS:
+                break
+            if frontier.is_new_document(pdf_url):
+                key = await download_document(fetcher, frontier, pdf_url)
+                if key:
+                    downloaded_files.append(key)
+                    # Random delay between downloads
+                    if fetcher.human_delays:
+                        await asyncio.sleep(random.uniform(1, 3))
+        document_urls = []
+
+        entry = frontier.pop()
+        if not entry:
+            break
+        page_url, depth = entry
+
+        try:
+            logger.info(f"Crawling URL: {page_url} (depth {depth})")
+            final_url, html, validators = await fetcher.fetch_page(page_url, frontier.validators(page_url))
+
+            # Random delay to mimic human behavior, after pages that were actually loaded
+            if fetcher.human_delays and html is not None:
+                await asyncio.sleep(random.uniform(2, 5))
+        except Exception as e:
+            logger.warning(f"Failed to crawl {page_url}: {e}")
+            continue
+
+        if html is None or not frontier.page_changed(page_url, html):
+            # Skip re-parsing, but still follow the stored links: child pages may
+            # have changed, and documents left over by an earlier crawl (download
+            # cap, failed download) are still pending. Unchanged children answer
+            # their conditional requests with 304, so the recheck stays cheap.
+            logger.info(f"Unchanged since last crawl, not re-parsing: {page_url}")
+            frontier.touch_page(page_url, validators)
+            stored_links = frontier.known[page_url].get("links") or []
+            for link_url in stored_links:
+                if is_pdf_url(link_url):
+                    document_urls.append(link_url)
+                else:
+                    frontier.add_page(link_url, depth + 1)
+            found_links = found_links or bool(stored_links)
+            continue
+
+        links, feeds = extract_links(html)
+        page_links = []
+        for href, text in links:
+            # Resolve relative URLs against the final page URL
+            link_url = normalize_url(href, final_url)
+            if not link_url or not is_relevant(link_url, text):
+                continue
+            page_links.append(link_url)
+            if is_pdf_url(link_url):
+                document_urls.append(link_url)
+            else:
+                frontier.add_page(link_url, depth + 1)
+
+        feed_urls = [normalize_url(feed, final_url) for feed in feeds]
+        document_urls += await discover_from_feeds(fetcher, frontier, [f for f in feed_urls if f], depth)
+        found_links = found_links or bool(page_links) or bool(document_urls)
+        frontier.record_page(page_url, depth, html, page_links, validators)
+
+    return downloaded_files, found_links
+
+
+async def _crawl(url: str, max_depth: int, mode: CrawlMode, jurisdiction: Optional[str]) -> list[str]:
+    """Crawl with the fetcher(s) `mode` selects; see crawl_and_download."""
+    if mode == "auto" and is_js_rendered(url):
+        mode = "browser"
+
+    downloaded_files = []
+    if mode in ("auto", "static"):
         try:
-            logger.info(f"Crawling URL: {url}")
-            await page.goto(url, wait_until="networkidle", timeout=60000)
-            
-            # Random delay to mimic human behavior
-            await asyncio.sleep(random.uniform(2, 5))
-            
-            # Find all links
-            links = await page.locator("a").all()
-            
-            for link in links:
-                href = await link.get_attribute("href")
-                text = await link.text_content()
-                
-                if href and text:
-                    # Check if link contains tax-related keywords
-                    keywords = ["tax", "amendment", "scheme", "regulation", "pdf"]
-                    if any(kw.lower() in (text.lower() + href.lower()) for kw in keywords):
-                        # Resolve relative URLs
-                        if href.startswith("http"):
-                            pdf_url = href
-                        else:
-                            pdf_url = url.rstrip("/") + "/" + href.lstrip("/")
-                        
-                        if pdf_url.lower().endswith(".pdf"):
-                            try:
-                                logger.info(f"Downloading PDF: {pdf_url}")
-                                file_name = pdf_url.split("/")[-1] or f"document_{len(downloaded_files)}.pdf"
-                                file_path = EVIDENCE_DIR / file_name
-                                
-                                # Download PDF using Playwright's download feature
-                                async with await context.expect_download() as download_info:
-                                    await link.click()
-                                download = await download_info.value
-                                await download.save_as(file_path)
-                                
-                                downloaded_files.append(str(file_path))
-                                logger.info(f"Downloaded: {file_path}")
-                                
-                                # Random delay between downloads
-                                await asyncio.sleep(random.uniform(1, 3))
-                            except Exception as e:
-                                logger.warning(f"Failed to download {pdf_url}: {e}")
-            
+            async with StaticFetcher() as fetcher:
+                downloaded_files, found_links = await walk(fetcher, CrawlFrontier(url, max_depth, jurisdiction))
+            if found_links or mode == "static":
+                return downloaded_files
+            logger.info(f"Static fetch found no relevant links on {url}, falling back to browser")
         except Exception as e:
-            logger.error(f"Crawling error for {url}: {e}")
-        finally:
-            await context.close()
-            await browser.close()
-    
+            logger.error(f"Static crawling error for {url}: {e}")
+            if mode == "static":
+                return downloaded_files
+
+    try:
+        async with BrowserFetcher() as fetcher:
+            browser_files, _ = await walk(fetcher, CrawlFrontier(url, max_depth, jurisdiction))
+            downloaded_files += browser_files
+    except Exception as e:
+        logger.error(f"Crawling error for {url}: {e}")
+
     return downloaded_files
 
 
-def sync_crawl_and_download(url: str) -> list[str]:
+async def crawl_and_download(
+    url: str,
+    max_depth: int = CRAWL_MAX_DEPTH,
+    mode: CrawlMode = "auto",
+    jurisdiction: Optional[str] = None,
+) -> list[str]:
+    """
+    Crawl a website and download PDF documents related to tax/amendments.
+
+    Pages are visited breadth first up to `max_depth` links from the seed,
+    starting from the seed page and any relevant sitemap entries. Pages are
+    requested conditionally with the validators of the last crawl; pages that
+    are unchanged are not re-parsed (their stored links are followed instead)
+    and documents downloaded by an earlier crawl are skipped.
+
+    Args:
+        url: Target URL to crawl
+        max_depth: Maximum link depth from the seed page
+        mode: "static" fetches pages over plain HTTP, "browser" renders them
+            with headless Chromium. "auto" uses the browser for sources listed
+            in JS_RENDERED_SOURCES and otherwise tries static first, falling
+            back to the browser when the static pages yield no relevant links.
+        jurisdiction: Jurisdiction the crawled pages are tagged with; defaults
+            to the source's entry in JURISDICTION_SOURCES
+
+    Returns:
+        Evidence store keys of newly downloaded PDFs, followed by PDFs downloaded
+        by earlier crawls whose analysis has not completed
+    """
+    downloaded_files = await _crawl(url, max_depth, mode, jurisdiction)
+
+    try:
+        pending = await asyncio.to_thread(unanalyzed_documents, url)
+    except Exception as e:
+        logger.error(f"Could not look up unanalyzed documents for {url}: {e}")
+        return downloaded_files
+    retried = [key for key in pending if key not in downloaded_files]
+    if retried:
+        logger.info(f"Retrying analysis of {len(retried)} documents from earlier crawls of {url}")
+    return downloaded_files + retried
+
+
+def sync_crawl_and_download(url: str, mode: CrawlMode = "auto") -> list[str]:
     """Synchronous wrapper for crawl_and_download"""
-    return asyncio.run(crawl_and_download(url))
+    return asyncio.run(crawl_and_download(url, mode=mode))
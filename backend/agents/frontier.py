@@ -0,0 +1,269 @@
+import hashlib
+import logging
+import posixpath
+from collections import deque
+from datetime import datetime
+from typing import Optional
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+from xml.etree import ElementTree
+from selectolax.lexbor import LexborHTMLParser
+from core.catalog import jurisdiction_for_url
+from core.db import crawl_pages
+from core.summary import invalidate_summary
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+FEED_TYPES = {"application/rss+xml", "application/atom+xml"}
+
+
+def normalize_url(href: str, base: Optional[str] = None) -> Optional[str]:
+    """
+    Resolve a link against its page and normalize it for deduplication.
+
+    Lowercases scheme and host, drops default ports and fragments, resolves
+    `.`/`..` path segments and sorts query parameters.
+
+    Returns:
+        The normalized absolute URL, or None for non-HTTP links
+    """
+    href = (href or "").strip()
+    if not href:
+        return None
+
+    url = urljoin(base, href) if base else href
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return None
+
+    host = parts.hostname.lower()
+    if ":" in host:
+        # hostname strips the brackets of IPv6 literals
+        host = f"[{host}]"
+    if parts.port and parts.port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{parts.port}"
+
+    path = parts.path or "/"
+    trailing_slash = path.endswith("/")
+    path = posixpath.normpath(path)
+    if not path.startswith("/"):
+        path = "/" + path
+    path = path.replace("//", "/")
+    if trailing_slash and path != "/":
+        path += "/"
+
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def is_pdf_url(url: str) -> bool:
+    """Check whether a normalized URL points to a PDF document."""
+    return urlsplit(url).path.lower().endswith(".pdf")
+
+
+def fingerprint(content: str) -> str:
+    """Content fingerprint used to detect changed pages between crawls."""
+    return hashlib.sha256(content.encode("utf-8", errors="ignore")).hexdigest()
+
+
+def extract_links(html: str) -> tuple[list[tuple[str, str]], list[str]]:
+    """
+    Parse an HTML page.
+
+    Returns:
+        Tuple of (list of (href, link text), list of feed hrefs)
+    """
+    try:
+        tree = LexborHTMLParser(html)
+    except Exception as e:
+        logger.warning(f"HTML parse error: {e}")
+        return [], []
+
+    links = [
+        (node.attributes.get("href") or "", node.text(separator=" ", strip=True))
+        for node in tree.css("a[href]")
+    ]
+    feeds = [
+        node.attributes.get("href")
+        for node in tree.css("link[href][type]")
+        if (node.attributes.get("type") or "").lower() in FEED_TYPES
+    ]
+    return links, feeds
+
+
+def parse_sitemap(xml_text: str) -> tuple[list[str], list[str]]:
+    """
+    Parse a sitemap or sitemap index.
+
+    Returns:
+        Tuple of (page URLs, nested sitemap URLs); empty for an empty body,
+        e.g. a source without a sitemap
+    """
+    if not xml_text.strip():
+        return [], []
+    try:
+        root = ElementTree.fromstring(xml_text)
+    except ElementTree.ParseError as e:
+        logger.warning(f"Invalid sitemap: {e}")
+        return [], []
+
+    urls, sitemaps = [], []
+    for element in root.iter():
+        if element.tag.endswith("}loc") or element.tag == "loc":
+            target = sitemaps if root.tag.endswith("sitemapindex") else urls
+            target.append((element.text or "").strip())
+    return urls, sitemaps
+
+
+def parse_feed(xml_text: str) -> list[str]:
+    """Extract entry links from an RSS or Atom feed."""
+    if not xml_text.strip():
+        return []
+    try:
+        root = ElementTree.fromstring(xml_text)
+    except ElementTree.ParseError as e:
+        logger.warning(f"Invalid feed: {e}")
+        return []
+
+    links = []
+    for element in root.iter():
+        if element.tag == "link" and element.text:
+            links.append(element.text.strip())  # RSS
+        elif element.tag.endswith("}link") and element.get("href"):
+            links.append(element.get("href"))  # Atom
+    return links
+
+
+def sitemap_candidates(robots_txt: str, seed_url: str) -> list[str]:
+    """Sitemap URLs announced in robots.txt, falling back to /sitemap.xml."""
+    sitemaps = [
+        line.split(":", 1)[1].strip()
+        for line in robots_txt.splitlines()
+        if line.lower().startswith("sitemap:")
+    ]
+    return sitemaps or [urljoin(seed_url, "/sitemap.xml")]
+
+
+class CrawlFrontier:
+    """
+    Persistent, deduplicated crawl frontier for one source.
+
+    Pages and documents are stored in `crawl_pages` with the fingerprint of
+    their HTML and outgoing links, so a re-crawl only re-parses pages whose
+    content changed and never downloads the same document twice.
+    """
+
+    def __init__(self, seed_url: str, max_depth: int = 2, jurisdiction: Optional[str] = None):
+        self.source = normalize_url(seed_url)
+        if not self.source:
+            raise ValueError(f"Unsupported URL: {seed_url}")
+        self.jurisdiction = jurisdiction or jurisdiction_for_url(self.source)
+        self.host = urlsplit(self.source).netloc
+        self.max_depth = max_depth
+        self.queue: deque[tuple[str, int]] = deque()
+        self.visited: set[str] = set()
+        self.known = {
+            record["url"]: record
+            for record in crawl_pages.find({"source": self.source})
+        }
+        self.add_page(self.source, 0)
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    def add_page(self, url: Optional[str], depth: int) -> bool:
+        """Queue an HTML page on the source host if not visited and within depth."""
+        if not url or url in self.visited or depth > self.max_depth:
+            return False
+        if urlsplit(url).netloc != self.host:
+            return False
+        self.visited.add(url)
+        self.queue.append((url, depth))
+        return True
+
+    def pop(self) -> Optional[tuple[str, int]]:
+        """Next (url, depth) to fetch, breadth first."""
+        return self.queue.popleft() if self.queue else None
+
+    def page_changed(self, url: str, content: str) -> bool:
+        """Check a fetched page against the fingerprint from the last crawl."""
+        record = self.known.get(url)
+        return not record or record.get("fingerprint") != fingerprint(content)
+
+    def validators(self, url: str) -> Optional[dict]:
+        """ETag/Last-Modified recorded for a page, to fetch it conditionally."""
+        record = self.known.get(url)
+        return record.get("validators") if record else None
+
+    def record_page(self, url: str, depth: int, content: str, links: list[str], validators: Optional[dict] = None):
+        """Persist a fetched page with its fingerprint, outgoing links and response validators."""
+        crawl_pages.update_one(
+            {"url": url},
+            {
+                "$set": {
+                    "source": self.source,
+                    "jurisdiction": self.jurisdiction,
+                    "kind": "page",
+                    "depth": depth,
+                    "fingerprint": fingerprint(content),
+                    "links": links,
+                    "validators": validators or {},
+                    "last_crawled": datetime.now(),
+                }
+            },
+            upsert=True,
+        )
+        invalidate_summary()
+
+    def touch_page(self, url: str, validators: Optional[dict] = None):
+        """Record that an unchanged page was checked, keeping source freshness current."""
+        update = {"last_crawled": datetime.now()}
+        if validators:
+            update["validators"] = validators
+        crawl_pages.update_one({"url": url}, {"$set": update})
+        invalidate_summary()
+
+    def is_new_document(self, url: Optional[str]) -> bool:
+        """Check whether a document URL still needs downloading, marking it as seen."""
+        if not url or url in self.visited:
+            return False
+        self.visited.add(url)
+        record = self.known.get(url)
+        return not (record and record.get("kind") == "document"
+                    and (record.get("blob") or record.get("file_path")))
+
+    def record_document(self, url: str, blob: str):
+        """
+        Persist a downloaded document and its evidence key so later crawls don't
+        download it again. It stays pending analysis until mark_analyzed.
+        """
+        crawl_pages.update_one(
+            {"url": url},
+            {
+                "$set": {
+                    "source": self.source,
+                    "jurisdiction": self.jurisdiction,
+                    "kind": "document",
+                    "blob": blob,
+                    "analyzed": False,
+                    "last_crawled": datetime.now(),
+                }
+            },
+            upsert=True,
+        )
+        invalidate_summary()
+
+
+def unanalyzed_documents(source: str) -> list[str]:
+    """Evidence keys of a source's downloaded documents whose analysis has not completed."""
+    return crawl_pages.distinct("blob", {"source": normalize_url(source), "kind": "document", "analyzed": False})
+
+
+def mark_analyzed(blobs: list[str], jurisdiction: str):
+    """Record that documents were analyzed against a jurisdiction's catalog, so they are not picked up again."""
+    if blobs:
+        crawl_pages.update_many(
+            {"blob": {"$in": blobs}, "jurisdiction": jurisdiction, "analyzed": False},
+            {"$set": {"analyzed": True}},
+        )
@@ -1,57 +1,144 @@
 import logging
-from pathlib import Path
 from typing import Optional
 import fitz  # PyMuPDF
+from core.evidence import get_evidence_store
 
 logger = logging.getLogger(__name__)
 
-EVIDENCE_DIR = Path(__file__).parent.parent / "evidence"
+SNIPPET_DPI = 144
+THUMBNAIL_DPI = 40
+SNIPPET_MARGIN = 24  # points of context around the highlighted text
 
 
-def generate_proof(pdf_path: str, quote_text: str, update_id: str) -> Optional[str]:
+def generate_proof(pdf_path: str, quote_text: str) -> Optional[list[dict]]:
     """
-    Generate a highlighted PDF with evidence text marked.
-    
+    Locate the evidence text in a PDF as a highlight overlay.
+
+    Only the highlight positions are returned and stored with the update; the
+    highlighted PDF is rendered on demand by `render_proof`, so the source
+    document is stored once however many updates cite it.
+
     Args:
         pdf_path: Path to the original PDF
         quote_text: Text to highlight in the PDF
-        update_id: ID of the update for naming the output file
-        
+
     Returns:
-        Path to the highlighted PDF
+        List of {"page": page number, "rect": [x0, y0, x1, y1]} highlights
     """
+    if not quote_text or not quote_text.strip():
+        # PyMuPDF crashes the process searching for None
+        return None
     try:
         # Open the PDF
         doc = fitz.open(pdf_path)
-        
-        # Search for the quote text and highlight it
-        highlight_count = 0
+
+        # Search for the quote text on each page
+        highlights = []
         for page_num in range(len(doc)):
             page = doc[page_num]
-            
-            # Search for text
-            text_dict = page.get_text("dict")
-            
+
             # Simple search: find all occurrences of the quote text
             for instance in page.search_for(quote_text):
-                # Highlight the found text in yellow
-                highlight = page.add_highlight_annot(instance)
-                highlight.set_colors({"stroke": [1, 1, 0]})  # Yellow highlight
-                highlight_count += 1
-        
-        if highlight_count == 0:
-            logger.warning(f"Quote text '{quote_text}' not found in {pdf_path}")
-            # Still save the PDF even if text not found
-        
-        # Save the highlighted PDF
-        output_path = EVIDENCE_DIR / "highlighted" / f"{update_id}_highlighted.pdf"
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        doc.save(output_path)
+                highlights.append({"page": page_num, "rect": list(instance)})
         doc.close()
-        
-        logger.info(f"Highlighted PDF saved: {output_path} ({highlight_count} highlights)")
-        return str(output_path)
-        
+
+        if not highlights:
+            logger.warning(f"Quote text '{quote_text}' not found in {pdf_path}")
+
+        logger.info(f"Evidence located in {pdf_path} ({len(highlights)} highlights)")
+        return highlights
+
     except Exception as e:
         logger.error(f"Error generating proof for {pdf_path}: {e}")
         return None
+
+
+def render_proof(pdf_bytes: bytes, highlights: list[dict]) -> bytes:
+    """
+    Render a highlighted PDF from the source document and its highlight overlay.
+
+    Args:
+        pdf_bytes: Contents of the original PDF
+        highlights: Highlights as returned by `generate_proof`
+
+    Returns:
+        Contents of the highlighted PDF, saved compacted and deflated
+    """
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    try:
+        for highlight in highlights:
+            page = doc[highlight["page"]]
+            annot = page.add_highlight_annot(fitz.Rect(highlight["rect"]))
+            annot.set_colors({"stroke": [1, 1, 0]})  # Yellow highlight
+            annot.update()
+        return doc.tobytes(garbage=4, deflate=True)
+    finally:
+        doc.close()
+
+
+def render_evidence_images(pdf_path: str, highlights: list[dict]) -> Optional[dict]:
+    """
+    Render the first highlighted region and its page as PNG images for the review queue.
+
+    Args:
+        pdf_path: Path to the original PDF
+        highlights: Highlights as returned by `generate_proof`
+
+    Returns:
+        {"page": page number, "snippet": PNG bytes, "thumbnail": PNG bytes},
+        or None if there is nothing to render
+    """
+    if not highlights:
+        return None
+
+    try:
+        doc = fitz.open(pdf_path)
+        try:
+            page_num = highlights[0]["page"]
+            page = doc[page_num]
+            rects = [fitz.Rect(h["rect"]) for h in highlights if h["page"] == page_num]
+            for rect in rects:
+                page.add_highlight_annot(rect).set_colors({"stroke": [1, 1, 0]})
+
+            # Snippet: full page width around the highlighted lines
+            region = fitz.Rect(rects[0])
+            for rect in rects[1:]:
+                region |= rect
+            clip = fitz.Rect(
+                page.rect.x0,
+                max(page.rect.y0, region.y0 - SNIPPET_MARGIN),
+                page.rect.x1,
+                min(page.rect.y1, region.y1 + SNIPPET_MARGIN),
+            )
+            snippet = page.get_pixmap(dpi=SNIPPET_DPI, clip=clip, annots=True)
+            thumbnail = page.get_pixmap(dpi=THUMBNAIL_DPI, annots=True)
+            return {
+                "page": page_num,
+                "snippet": snippet.tobytes("png"),
+                "thumbnail": thumbnail.tobytes("png"),
+            }
+        finally:
+            doc.close()
+    except Exception as e:
+        logger.error(f"Error rendering evidence images for {pdf_path}: {e}")
+        return None
+
+
+def cache_evidence_images(pdf_path: str, highlights: list[dict]) -> Optional[dict]:
+    """
+    Render the evidence images and store them next to the document in the evidence store.
+
+    Returns:
+        Fields to set on the pending update: evidence_page, evidence_snippet
+        and evidence_thumbnail (evidence store keys of the PNGs)
+    """
+    images = render_evidence_images(pdf_path, highlights)
+    if not images:
+        return None
+
+    store = get_evidence_store()
+    return {
+        "evidence_page": images["page"],
+        "evidence_snippet": store.put_bytes(images["snippet"], "png"),
+        "evidence_thumbnail": store.put_bytes(images["thumbnail"], "png"),
+    }
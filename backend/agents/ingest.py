@@ -0,0 +1,250 @@
+import asyncio
+import hashlib
+import logging
+import time
+import httpx
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from agents.analyzer import extract_pdf_text, generate_analysis_async, parse_analysis_json, pending_update_upsert
+from agents.frontier import mark_analyzed
+from agents.pipeline import highlight_quote
+from core.catalog import DEFAULT_JURISDICTION
+from core.db import crawl_pages, pending_updates
+from core.evidence import get_evidence_store
+from core.health import backend_available, check_backend, mark_unavailable, start_warming
+from core.summary import invalidate_summary
+
+try:
+    from config import ANALYSIS_MAX_WORKERS, ANALYSIS_MAX_CONCURRENT_LLM_CALLS, INGEST_BATCH_SIZE
+except ImportError:
+    ANALYSIS_MAX_WORKERS = 4
+    ANALYSIS_MAX_CONCURRENT_LLM_CALLS = 2
+    INGEST_BATCH_SIZE = 50
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_INTERVAL = 10  # seconds between progress reports
+
+
+def file_blob_key(path: Path) -> str:
+    """Evidence key a file would be stored under, hashed in chunks without reading it whole."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return f"{digest.hexdigest()}.pdf"
+
+
+def find_pdfs(directory: Path) -> list[Path]:
+    return sorted(path for path in directory.rglob("*") if path.is_file() and path.suffix.lower() == ".pdf")
+
+
+class IngestProgress:
+    """Counts processed documents and logs throughput and ETA periodically."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.done = 0
+        self.changes = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self.last_report = self.started
+
+    def add(self, changed: bool = False, failed: bool = False):
+        self.done += 1
+        self.changes += changed
+        self.failed += failed
+        now = time.monotonic()
+        if now - self.last_report >= PROGRESS_INTERVAL or self.done == self.total:
+            self.last_report = now
+            logger.info(self.report())
+
+    def report(self) -> str:
+        elapsed = time.monotonic() - self.started
+        rate = self.done / elapsed if elapsed else 0.0
+        eta = (self.total - self.done) / rate if rate else float("inf")
+        eta_text = time.strftime("%H:%M:%S", time.gmtime(eta)) if eta != float("inf") else "--:--:--"
+        return (
+            f"{self.done}/{self.total} documents, {self.changes} changes, {self.failed} failed, "
+            f"{rate * 60:.1f} docs/min, ETA {eta_text}"
+        )
+
+
+async def _ingest_document(
+    pool: ProcessPoolExecutor,
+    llm_slots: asyncio.Semaphore,
+    path: Path,
+    document_key: str,
+    jurisdiction: str,
+) -> Optional[dict]:
+    """
+    Extract, analyze and highlight one archived PDF without writing to the database.
+
+    Returns:
+        {"path", "blob", "update": (filter, update) or None}, or None if the
+        document could not be analyzed and should be retried on the next run
+    """
+    loop = asyncio.get_running_loop()
+    pdf_text = await loop.run_in_executor(pool, extract_pdf_text, str(path))
+    if not pdf_text:
+        logger.warning(f"No text extracted from {path}")
+        return {"path": path, "blob": document_key, "update": None}
+
+    async with llm_slots:
+        # Fail fast while the model server is down; the document is retried on the next run
+        if not await backend_available("ollama"):
+            raise RuntimeError("model server unavailable")
+        try:
+            response_text = await generate_analysis_async(pdf_text, jurisdiction)
+        except (httpx.TransportError, ConnectionError) as e:
+            mark_unavailable("ollama", str(e) or type(e).__name__)
+            raise
+    result = parse_analysis_json(response_text)
+    if not result:
+        return None
+
+    await asyncio.to_thread(get_evidence_store().put_file, str(path))
+    if not result.change_detected:
+        return {"path": path, "blob": document_key, "update": None}
+
+    query, update = await asyncio.to_thread(
+        pending_update_upsert, result.item, result.new_val, document_key, result.quote, document_key, jurisdiction
+    )
+    evidence = await highlight_quote(pool, str(path), result.quote)
+    if evidence:
+        update["$setOnInsert"].update(evidence)
+    return {"path": path, "blob": document_key, "update": (query, update)}
+
+
+def flush(batch: list[dict], source: str, jurisdiction: str) -> int:
+    """
+    Bulk-write the pending updates of a batch, then register its documents.
+
+    Registering a document is the checkpoint: it is only written once the
+    document's update is stored, and registered documents are skipped by
+    later runs.
+
+    Returns:
+        Number of pending updates created
+    """
+    if not batch:
+        return 0
+
+    created = 0
+    updates = [UpdateOne(*result["update"], upsert=True) for result in batch if result["update"]]
+    if updates:
+        try:
+            created = pending_updates.bulk_write(updates, ordered=False).upserted_count
+        except BulkWriteError as e:
+            # Duplicate keys mean a concurrent crawl stored the same update first
+            if any(error["code"] != 11000 for error in e.details["writeErrors"]):
+                raise
+            created = e.details["nUpserted"]
+
+    now = datetime.now()
+    crawl_pages.bulk_write([
+        UpdateOne(
+            {"url": result["path"].resolve().as_uri()},
+            {
+                "$set": {
+                    "source": source,
+                    "jurisdiction": jurisdiction,
+                    "kind": "document",
+                    "blob": result["blob"],
+                    "analyzed": True,
+                    "last_crawled": now,
+                }
+            },
+            upsert=True,
+        )
+        for result in batch
+    ], ordered=False)
+    # A crawl may have downloaded the same documents without analyzing them
+    mark_analyzed([result["blob"] for result in batch], jurisdiction)
+    invalidate_summary()
+    return created
+
+
+async def ingest_directory(
+    directory: str,
+    jurisdiction: str = DEFAULT_JURISDICTION,
+    max_workers: int = ANALYSIS_MAX_WORKERS,
+    max_llm_calls: int = ANALYSIS_MAX_CONCURRENT_LLM_CALLS,
+    batch_size: int = INGEST_BATCH_SIZE,
+) -> dict:
+    """
+    Backfill pending updates from a directory of archived PDFs of one jurisdiction.
+
+    Files whose content hash is already registered and analyzed (by an earlier
+    ingest or a crawl) are skipped, so an interrupted run resumes where its last batch was
+    written. Extraction and highlighting run in a process pool, model calls are
+    limited to `max_llm_calls` in flight, and results are written in bulk every
+    `batch_size` documents.
+
+    Returns:
+        {"found", "skipped", "processed", "failed", "updates_created"}
+    """
+    root = Path(directory)
+    source = root.resolve().as_uri()
+    paths = find_pdfs(root)
+
+    # Hash files in threads; hashlib releases the GIL on large reads
+    with ThreadPoolExecutor(max_workers=max_workers) as hashers:
+        keys = list(hashers.map(file_blob_key, paths))
+    # Documents a crawl downloaded but did not analyze are not skipped
+    registered = set(crawl_pages.distinct("blob", {"kind": "document", "analyzed": {"$ne": False}}))
+
+    todo, seen = [], set()
+    for path, key in zip(paths, keys):
+        if key not in registered and key not in seen:
+            seen.add(key)
+            todo.append((path, key))
+    stats = {"found": len(paths), "skipped": len(paths) - len(todo), "processed": 0, "failed": 0, "updates_created": 0}
+    logger.info(f"Found {len(paths)} PDFs in {directory}, {len(todo)} to ingest")
+    if not todo:
+        return stats
+
+    model = await check_backend("ollama", force=True)
+    if model["status"] == "unavailable":
+        raise RuntimeError(f"Model server unavailable: {model.get('error')}")
+    if not model.get("loaded"):
+        await start_warming()
+
+    progress = IngestProgress(len(todo))
+    llm_slots = asyncio.Semaphore(max_llm_calls)
+    # Bound documents in flight so extracted text does not pile up ahead of the model
+    in_flight = asyncio.Semaphore(max_workers + max_llm_calls)
+    batch: list[dict] = []
+
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(todo))) as pool:
+
+        async def run(path: Path, key: str) -> Optional[dict]:
+            async with in_flight:
+                try:
+                    return await _ingest_document(pool, llm_slots, path, key, jurisdiction)
+                except Exception as e:
+                    logger.error(f"Error ingesting {path}: {e}")
+                    return None
+
+        tasks = [asyncio.create_task(run(path, key)) for path, key in todo]
+        for finished in asyncio.as_completed(tasks):
+            result = await finished
+            if result is None:
+                stats["failed"] += 1
+                progress.add(failed=True)
+                continue
+
+            stats["processed"] += 1
+            progress.add(changed=result["update"] is not None)
+            batch.append(result)
+            if len(batch) >= batch_size:
+                stats["updates_created"] += await asyncio.to_thread(flush, batch, source, jurisdiction)
+                batch = []
+
+        stats["updates_created"] += await asyncio.to_thread(flush, batch, source, jurisdiction)
+
+    return stats
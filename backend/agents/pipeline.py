@@ -0,0 +1,139 @@
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from bson import ObjectId
+from agents.analyzer import extract_pdf_text, analyze_text_async
+from agents.frontier import mark_analyzed
+from agents.highlighter import generate_proof, cache_evidence_images
+from core.catalog import DEFAULT_JURISDICTION
+from core.db import pending_updates
+from core.evidence import get_evidence_store
+from core.health import backend_available
+
+try:
+    from config import ANALYSIS_MAX_WORKERS, ANALYSIS_MAX_CONCURRENT_LLM_CALLS
+except ImportError:
+    ANALYSIS_MAX_WORKERS = 4
+    ANALYSIS_MAX_CONCURRENT_LLM_CALLS = 2
+
+logger = logging.getLogger(__name__)
+
+
+async def highlight_quote(pool: ProcessPoolExecutor, pdf_path: str, quote: Optional[str]) -> Optional[dict]:
+    """
+    Locate a quote in a PDF and pre-render the snippet and page thumbnail shown
+    in the review queue, in the process pool.
+
+    Returns:
+        Fields to store on the pending update, or None if there is no quote or
+        it was not found
+    """
+    if not quote or not quote.strip():
+        return None
+    loop = asyncio.get_running_loop()
+    highlights = await loop.run_in_executor(pool, generate_proof, pdf_path, quote)
+    if highlights is None:
+        return None
+    images = await loop.run_in_executor(pool, cache_evidence_images, pdf_path, highlights)
+    return {"evidence_highlights": highlights, **(images or {})}
+
+
+async def _process_document(
+    pool: ProcessPoolExecutor,
+    llm_slots: asyncio.Semaphore,
+    document_key: str,
+    jurisdiction: str,
+) -> Optional[dict]:
+    """
+    Extract, analyze and highlight a single downloaded PDF.
+
+    The document is marked analyzed only once its results are stored; until
+    then later crawls pick it up again.
+    """
+    loop = asyncio.get_running_loop()
+    pdf_path = await asyncio.to_thread(get_evidence_store().local_path, document_key)
+
+    # CPU-bound extraction runs in a worker process
+    pdf_text = await loop.run_in_executor(pool, extract_pdf_text, pdf_path)
+    if not pdf_text:
+        logger.warning(f"No text extracted from {pdf_path}")
+        # Nothing a retry could analyze
+        await asyncio.to_thread(mark_analyzed, [document_key], jurisdiction)
+        return None
+
+    async with llm_slots:
+        # Skip rather than wait out the model call timeout while the model server is down
+        if not await backend_available("ollama"):
+            logger.warning(f"Model server unavailable, leaving {document_key} for the next crawl")
+            return None
+        result = await analyze_text_async(document_key, pdf_text, jurisdiction)
+    if not result:
+        return None
+
+    # Store the highlight overlay on the update this analysis created
+    if result.change_detected and result.update_id:
+        evidence = await highlight_quote(pool, pdf_path, result.quote)
+        if evidence:
+            await asyncio.to_thread(
+                pending_updates.update_one,
+                {"_id": ObjectId(result.update_id)},
+                {"$set": evidence},
+            )
+
+    await asyncio.to_thread(mark_analyzed, [document_key], jurisdiction)
+    return {
+        "pdf": document_key,
+        "change_detected": result.change_detected,
+        "item": result.item,
+        "new_val": result.new_val,
+        "update_id": result.update_id,
+    }
+
+
+async def process_documents(
+    document_keys: list[str],
+    max_workers: int = ANALYSIS_MAX_WORKERS,
+    max_llm_calls: int = ANALYSIS_MAX_CONCURRENT_LLM_CALLS,
+    jurisdiction: str = DEFAULT_JURISDICTION,
+) -> list[dict]:
+    """
+    Analyze and highlight downloaded PDFs concurrently.
+
+    Text extraction and highlighting run in a bounded process pool, model calls
+    run as async tasks limited by `max_llm_calls`.
+
+    Args:
+        document_keys: Evidence store keys of the downloaded PDFs
+        max_workers: Size of the process pool
+        max_llm_calls: Maximum number of model calls in flight
+        jurisdiction: Jurisdiction of the documents' source; only its catalog
+            is loaded for analysis
+
+    Returns:
+        Analysis results in the same order as `document_keys`, skipping documents
+        that could not be analyzed; those stay pending for the next crawl
+    """
+    if not document_keys:
+        return []
+
+    llm_slots = asyncio.Semaphore(max_llm_calls)
+    results: list[Optional[dict]] = [None] * len(document_keys)
+
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(document_keys))) as pool:
+
+        async def run(index: int, document_key: str) -> tuple[int, Optional[dict]]:
+            try:
+                return index, await _process_document(pool, llm_slots, document_key, jurisdiction)
+            except Exception as e:
+                logger.error(f"Error processing document {document_key}: {e}")
+                return index, None
+
+        tasks = [asyncio.create_task(run(i, key)) for i, key in enumerate(document_keys)]
+        for finished in asyncio.as_completed(tasks):
+            index, result = await finished
+            results[index] = result
+            if result:
+                logger.info(f"Processed {result['pdf']} (change_detected={result['change_detected']})")
+
+    return [result for result in results if result]
@@ -0,0 +1,79 @@
+"""
+Benchmark the static HTTP fetch mode against the headless browser path.
+
+Serves the listing pages in benchmarks/fixtures/portal from a local HTTP
+server and times fetching and parsing them with each fetcher.
+
+Usage:
+    python benchmarks/crawl_modes.py [--rounds 5] [--modes static browser]
+"""
+
+import argparse
+import asyncio
+import functools
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.crawler import BrowserFetcher, StaticFetcher, is_relevant  # noqa: E402
+from agents.frontier import extract_links, normalize_url  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "portal"
+PAGES = ["index.html", "amendments.html"]
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixtures() -> ThreadingHTTPServer:
+    handler = functools.partial(QuietHandler, directory=str(FIXTURES_DIR))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run_mode(fetcher_class, base_url: str, rounds: int) -> tuple[float, int]:
+    """Returns (seconds per page, relevant links found per round)."""
+    started = time.perf_counter()
+    found = 0
+    async with fetcher_class() as fetcher:
+        for _ in range(rounds):
+            found = 0
+            for page in PAGES:
+                final_url, html, _ = await fetcher.fetch_page(base_url + page)
+                links, _ = extract_links(html)
+                found += sum(
+                    1 for href, text in links
+                    if (url := normalize_url(href, final_url)) and is_relevant(url, text)
+                )
+    elapsed = time.perf_counter() - started
+    return elapsed / (rounds * len(PAGES)), found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", choices=["static", "browser"], default=["static", "browser"])
+    args = parser.parse_args()
+
+    server = serve_fixtures()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+    fetchers = {"static": StaticFetcher, "browser": BrowserFetcher}
+
+    print(f"{'mode':<10}{'ms/page':>12}{'links/round':>14}")
+    try:
+        for mode in args.modes:
+            per_page, found = asyncio.run(run_mode(fetchers[mode], base_url, args.rounds))
+            print(f"{mode:<10}{per_page * 1000:>12.1f}{found:>14}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
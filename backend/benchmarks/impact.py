@@ -0,0 +1,64 @@
+"""
+Benchmark the rate-change impact engine on synthetic transaction volumes.
+
+Times building the per-item aggregates (done once per import) and simulating
+a batch of rate changes against them.
+
+Usage:
+    python benchmarks/impact.py [--line-items 5000000] [--items 500] [--changes 50]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.impact import ImpactEngine  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--line-items", type=int, default=5_000_000)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--changes", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    item_names = np.array([f"item-{i:04d}" for i in range(args.items)])
+    item_codes = rng.integers(0, args.items, args.line_items).astype(np.int32)
+    quantity = rng.integers(1, 20, args.line_items).astype(np.float64)
+    unit_price = rng.uniform(10, 5000, args.line_items)
+
+    started = time.perf_counter()
+    engine = ImpactEngine(np.full(args.items, "GST"), item_names, item_codes, quantity, unit_price)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    changes = [
+        {
+            "id": str(i),
+            "jurisdiction": "GST",
+            "item": str(item_names[i % args.items]),
+            "new_rate": float(rng.choice([5, 12, 18, 28])),
+        }
+        for i in range(args.changes)
+    ]
+    current_rates = {("GST", str(name)): 18.0 for name in item_names}
+    timings = []
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        engine.simulate(changes, current_rates)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    print(f"line items:        {args.line_items:>10}")
+    print(f"build aggregates:  {build_ms:8.1f} ms")
+    print(f"simulate {args.changes:>4} changes: {statistics.median(timings):6.2f} ms (median of {args.runs})")
+
+
+if __name__ == "__main__":
+    main()
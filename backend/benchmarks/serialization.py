@@ -0,0 +1,110 @@
+"""
+Benchmark the CPU cost of serializing a 10k-row /audit-logs response.
+
+Compares the former path (decode full entries, rebuild a dict per row with
+isoformat(), FastAPI's jsonable_encoder and the stdlib JSON encoder) with the
+current one (decode entries already projected into the response shape by
+MongoDB, serialize them as they are with ORJSONResponse). Both include
+decoding the raw BSON batch, as the driver does for every cursor batch.
+
+Usage:
+    python benchmarks/serialization.py [--rows 10000] [--runs 10]
+"""
+
+import argparse
+import hashlib
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import bson
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.models import AuditLogResponse  # noqa: E402
+
+
+def make_entries(rows: int) -> list[dict]:
+    started = datetime(2024, 1, 1)
+    entries, prev_hash = [], "0" * 64
+    for seq in range(1, rows + 1):
+        entry_hash = hashlib.sha256(f"{seq}{prev_hash}".encode()).hexdigest()
+        entries.append({
+            "_id": ObjectId(),
+            "seq": seq,
+            "jurisdiction": "GST",
+            "action": "update_accepted" if seq % 3 else "update_rejected",
+            "item_name": f"Item {seq % 200}",
+            "old_value": 18.0,
+            "new_value": 12.0,
+            "evidence_blob": hashlib.sha256(str(seq % 500).encode()).hexdigest() + ".pdf",
+            "timestamp": started + timedelta(minutes=seq),
+            "prev_hash": prev_hash,
+            "hash": entry_hash,
+        })
+        prev_hash = entry_hash
+    return entries
+
+
+def legacy_response(batch: bytes) -> bytes:
+    result = []
+    for log in bson.decode_all(batch):
+        result.append({
+            "id": str(log["_id"]),
+            "jurisdiction": log["jurisdiction"],
+            "action": log["action"],
+            "item_name": log["item_name"],
+            "old_value": log["old_value"],
+            "new_value": log["new_value"],
+            "timestamp": log["timestamp"].isoformat() if isinstance(log["timestamp"], datetime) else log["timestamp"],
+            "seq": log["seq"],
+            "hash": log["hash"],
+        })
+    return JSONResponse(jsonable_encoder(result)).body
+
+
+def projected_response(batch: bytes) -> bytes:
+    return ORJSONResponse(bson.decode_all(batch)).body
+
+
+def cpu_ms(func, batch: bytes, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.process_time()
+        func(batch)
+        timings.append((time.process_time() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    entries = make_entries(args.rows)
+    full_batch = b"".join(bson.encode(entry) for entry in entries)
+    # What the server returns for the response_projection of AuditLogResponse
+    projected_batch = b"".join(
+        bson.encode({
+            "id": str(entry["_id"]),
+            **{field: entry[field] for field in AuditLogResponse.model_fields if field != "id"},
+        })
+        for entry in entries
+    )
+
+    legacy = cpu_ms(legacy_response, full_batch, args.runs)
+    projected = cpu_ms(projected_response, projected_batch, args.runs)
+    print(f"rows:                          {args.rows:>8}")
+    print(f"per-row dicts + json:          {legacy:8.1f} ms CPU (median of {args.runs})")
+    print(f"projected rows + orjson:       {projected:8.1f} ms CPU")
+    print(f"speedup:                       {legacy / projected:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
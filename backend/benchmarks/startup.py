@@ -0,0 +1,68 @@
+"""
+Benchmark API cold start: importing main.py and running its startup hooks.
+
+Each run uses a fresh interpreter so module caches do not hide import cost.
+Also reports whether any of the heavy agent dependencies were loaded.
+
+Usage:
+    python benchmarks/startup.py [--runs 5]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+HEAVY_MODULES = ["playwright", "fake_useragent", "fitz", "ollama", "numpy"]
+
+PROBE = f"""
+import asyncio, json, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+async def lifespan():
+    async with main.app.router.lifespan_context(main.app):
+        pass
+
+asyncio.run(lifespan())
+ready = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (ready - imported) * 1000,
+    "heavy_modules": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def run_once() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results = [run_once() for _ in range(args.runs)]
+    import_ms = statistics.median(r["import_ms"] for r in results)
+    startup_ms = statistics.median(r["startup_ms"] for r in results)
+
+    print(f"import main:   {import_ms:8.1f} ms (median of {args.runs})")
+    print(f"startup hooks: {startup_ms:8.1f} ms")
+    print(f"total:         {import_ms + startup_ms:8.1f} ms")
+    print(f"heavy modules loaded: {', '.join(results[0]['heavy_modules']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,11 +19,59 @@ API_DEBUG = True
 # Ollama Configuration
 OLLAMA_BASE_URL = "http://localhost:11434"
 OLLAMA_MODEL = "llama2"
+OLLAMA_PREWARM = True  # load the model at API startup so the first analysis does not pay load time
+OLLAMA_KEEP_ALIVE = "30m"  # how long the model stays loaded after the pre-warm or an analysis
+OLLAMA_TIMEOUT = 300  # seconds a model call (including a cold load) may take before it is abandoned
 
 # Application Settings
 CRAWL_TIMEOUT = 60000  # milliseconds
 PDF_SEARCH_KEYWORDS = ["tax", "amendment", "scheme", "regulation", "policy"]
 MAX_PDF_DOWNLOADS = 20
+CRAWL_MAX_DEPTH = 2  # link depth followed from the seed page
+CRAWL_HTTP_MAX_CONNECTIONS = 10  # connection pool size for static (non-browser) crawling
+JS_RENDERED_SOURCES = []  # hosts whose listings need a browser to render, e.g. "gst.gov.in"
+ANALYSIS_MAX_WORKERS = 4  # processes for PDF text extraction and highlighting
+ANALYSIS_MAX_CONCURRENT_LLM_CALLS = 2
+INGEST_BATCH_SIZE = 50  # documents per bulk write (and checkpoint) in `lexaudit.py ingest`
+
+# Jurisdictions: tax_schemes holds one catalog per jurisdiction
+DEFAULT_JURISDICTION = "GST"
+JURISDICTION_SOURCES = {}  # host -> jurisdiction of its documents, e.g. {"mahagst.gov.in": "MH"}
+CATALOG_CACHE_TTL = 30  # seconds a jurisdiction's catalog is cached for analysis
+
+# Evidence storage
+EVIDENCE_BACKEND = "local"  # "local" (backend/evidence/blobs) or "s3"
+EVIDENCE_S3_BUCKET = "lexaudit-evidence"
+EVIDENCE_S3_PREFIX = "blobs/"
+EVIDENCE_S3_ENDPOINT_URL = None  # e.g. "http://localhost:9000" for a local MinIO
+EVIDENCE_GC_GRACE_HOURS = 24  # never collect blobs younger than this
+
+# Dashboard summary cache (also invalidated on writes)
+SUMMARY_CACHE_TTL = 10  # seconds
+
+# Audit log listing: /audit-logs returns at most one page, clients page back with before_timestamp/before_seq
+AUDIT_LOG_PAGE_SIZE = 100
+AUDIT_LOG_MAX_PAGE_SIZE = 1000
+
+# Rate-change impact simulation (import with: python import_transactions.py <csv>)
+TRANSACTIONS_PATH = "data/transactions.npz"
+
+# Admission control
+RATE_LIMITS = {  # per client and tier: (burst size, sustained requests per second)
+    "default": (60, 10.0),  # every route
+    "expensive": (10, 0.5),  # evidence rendering, impact simulation, chain verification
+    "crawl": (3, 1 / 60),  # POST /crawl
+}
+MAX_TRACKED_CLIENTS = 10000
+MAX_CONCURRENT_JOBS = 2  # crawl/analysis jobs running at once
+MAX_QUEUED_JOBS = 4  # jobs waiting for a slot; more are rejected with 429
+JOB_QUEUE_TIMEOUT = 30  # seconds a queued job waits before being rejected
+
+# Health checks (/health/ready, and job dispatch)
+HEALTH_CACHE_TTL = 5  # seconds a probe result is reused
+HEALTH_PROBE_TIMEOUT = 2  # seconds
+MONGO_SLOW_PING_MS = 100  # ping latency above this reports MongoDB as degraded
+BROWSER_PROBE_TTL = 300  # seconds; probing launches Chromium, so it is re-checked less often
 
 # Logging
 LOG_LEVEL = "INFO"
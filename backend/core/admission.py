@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from fastapi import HTTPException, Request
+
+try:
+    from config import RATE_LIMITS, MAX_TRACKED_CLIENTS, MAX_CONCURRENT_JOBS, MAX_QUEUED_JOBS, JOB_QUEUE_TIMEOUT
+except ImportError:
+    RATE_LIMITS = {"default": (60, 10.0), "expensive": (10, 0.5), "crawl": (3, 1 / 60)}
+    MAX_TRACKED_CLIENTS = 10000
+    MAX_CONCURRENT_JOBS = 2
+    MAX_QUEUED_JOBS = 4
+    JOB_QUEUE_TIMEOUT = 30
+
+logger = logging.getLogger(__name__)
+
+
+def too_many_requests(retry_after: float, detail: str, status_code: int = 429) -> HTTPException:
+    return HTTPException(
+        status_code=status_code,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class TokenBucket:
+    """Allows bursts of `capacity` requests, refilled at `rate` tokens per second."""
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Take a token. Returns 0 if one was available, else seconds until the next one."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Per-client token buckets for one tier of routes, keeping the most recently seen clients."""
+
+    def __init__(self, capacity: float, rate: float, max_clients: int = MAX_TRACKED_CLIENTS):
+        self.capacity = capacity
+        self.rate = rate
+        self.max_clients = max_clients
+        self.buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+
+    def take(self, client: str) -> float:
+        bucket = self.buckets.get(client)
+        if bucket is None:
+            bucket = self.buckets[client] = TokenBucket(self.capacity, self.rate)
+            if len(self.buckets) > self.max_clients:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(client)
+        return bucket.take()
+
+
+class JobGate:
+    """
+    Caps the number of crawl/analysis jobs running at once.
+
+    Up to `max_queued` further jobs wait for a slot for at most `queue_timeout`
+    seconds; beyond that, jobs are rejected with a Retry-After estimated from
+    recent job durations.
+    """
+
+    def __init__(self, max_running: int, max_queued: int, queue_timeout: float):
+        self.max_running = max_running
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.running = 0
+        self.queued = 0
+        self.avg_duration = 60.0  # seconds, refined as jobs finish
+        self._slots = asyncio.Semaphore(max_running)
+
+    @property
+    def saturated(self) -> bool:
+        return self.running >= self.max_running and self.queued >= self.max_queued
+
+    def retry_after(self) -> float:
+        return self.avg_duration * (self.queued + 1) / self.max_running
+
+    @asynccontextmanager
+    async def slot(self):
+        if self.saturated:
+            raise too_many_requests(self.retry_after(), "Too many jobs in progress, retry later")
+
+        self.queued += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise too_many_requests(self.retry_after(), "Too many jobs in progress, retry later")
+        finally:
+            self.queued -= 1
+
+        self.running += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.running -= 1
+            self._slots.release()
+            self.avg_duration = 0.8 * self.avg_duration + 0.2 * (time.monotonic() - started)
+
+
+limiters = {tier: RateLimiter(capacity, rate) for tier, (capacity, rate) in RATE_LIMITS.items()}
+crawl_jobs = JobGate(MAX_CONCURRENT_JOBS, MAX_QUEUED_JOBS, JOB_QUEUE_TIMEOUT)
+
+
+def client_id(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit(tier: str):
+    """Route dependency charging the calling client one request in the given tier."""
+    limiter = limiters[tier]
+
+    async def check(request: Request):
+        retry_after = limiter.take(client_id(request))
+        if retry_after:
+            logger.warning(f"Rate limited {client_id(request)} on {request.url.path} ({tier})")
+            raise too_many_requests(retry_after, "Rate limit exceeded")
+
+    return check
+
+
+async def shed_when_busy(request: Request):
+    """
+    Route dependency rejecting expensive non-job work while the job queue is full,
+    so the node keeps capacity for reads and the jobs already admitted.
+    """
+    if crawl_jobs.saturated:
+        logger.warning(f"Shedding {request.url.path}: job queue full")
+        raise too_many_requests(crawl_jobs.avg_duration / crawl_jobs.max_running, "Server busy, retry later", 503)
@@ -0,0 +1,301 @@
+import hashlib
+import heapq
+import json
+import logging
+from datetime import datetime
+from typing import Iterator, Optional
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import DuplicateKeyError
+from core.catalog import DEFAULT_JURISDICTION
+from core.db import db, audit_logs, audit_chain, audit_rollup_items, audit_rollup_daily
+
+try:
+    from config import AUDIT_LOG_PAGE_SIZE, AUDIT_LOG_MAX_PAGE_SIZE
+except ImportError:
+    AUDIT_LOG_PAGE_SIZE = 100
+    AUDIT_LOG_MAX_PAGE_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+PARTITION_PREFIX = "audit_logs_"
+GENESIS_HASH = "0" * 64
+CHAIN_FIELDS = ("seq", "action", "item_name", "old_value", "new_value", "evidence_blob", "timestamp", "prev_hash")
+
+_indexed_partitions: set[str] = set()
+
+
+def partition_name(timestamp: datetime) -> str:
+    """Monthly partition holding audit entries of the given time, e.g. audit_logs_2024_01."""
+    return f"{PARTITION_PREFIX}{timestamp:%Y_%m}"
+
+
+def _partition(name: str):
+    collection = db[name]
+    if name not in _indexed_partitions:
+        # seq breaks timestamp ties, so pages of newest-first listings are stable
+        collection.create_index([("timestamp", DESCENDING), ("seq", DESCENDING)])
+        collection.create_index([("item_name", ASCENDING), ("timestamp", DESCENDING), ("seq", DESCENDING)])
+        collection.create_index("seq", unique=True)
+        _indexed_partitions.add(name)
+    return collection
+
+
+def list_partitions(since: Optional[datetime] = None, until: Optional[datetime] = None) -> list[str]:
+    """Partition names overlapping [since, until], newest first."""
+    names = [
+        name for name in db.list_collection_names()
+        if name.startswith(PARTITION_PREFIX) and name[len(PARTITION_PREFIX):].replace("_", "").isdigit()
+    ]
+    if since:
+        names = [name for name in names if name >= partition_name(since)]
+    if until:
+        names = [name for name in names if name <= partition_name(until)]
+    return sorted(names, reverse=True)
+
+
+def entry_hash(entry: dict) -> str:
+    """Hash of an audit entry's fields, including the previous entry's hash."""
+    payload = {field: entry.get(field) for field in CHAIN_FIELDS}
+    # Entries written before jurisdictions were tracked hash without the field
+    if "jurisdiction" in entry:
+        payload["jurisdiction"] = entry["jurisdiction"]
+    payload["timestamp"] = payload["timestamp"].isoformat(timespec="milliseconds")
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def rollup_item_key(item_name: str, jurisdiction: Optional[str]) -> dict:
+    """
+    _id of an item's rollup. Items are counted per jurisdiction, since catalogs
+    share item names; entries from before jurisdictions count under the default.
+    """
+    return {"jurisdiction": jurisdiction or DEFAULT_JURISDICTION, "item": item_name}
+
+
+def _write_entry(entry: dict) -> bool:
+    """
+    Write a chained entry to its partition and update the rollups, then clear
+    it from the chain head. Returns False if another writer already wrote it.
+    """
+    try:
+        _partition(partition_name(entry["timestamp"])).insert_one(entry)
+        written = True
+    except DuplicateKeyError:
+        written = False
+    audit_chain.update_one({"_id": "head", "seq": entry["seq"]}, {"$unset": {"pending": ""}})
+    if not written:
+        return False
+
+    increments = {"total": 1, f"actions.{entry['action']}": 1}
+    audit_rollup_items.update_one(
+        {"_id": rollup_item_key(entry["item_name"], entry.get("jurisdiction"))},
+        {
+            "$inc": increments,
+            "$max": {"last_timestamp": entry["timestamp"]},
+        },
+        upsert=True,
+    )
+    audit_rollup_daily.update_one(
+        {"_id": entry["timestamp"].strftime("%Y-%m-%d")},
+        {"$inc": increments},
+        upsert=True,
+    )
+    return True
+
+
+def complete_pending_entry(head: Optional[dict] = None) -> bool:
+    """
+    Write the entry the chain head was advanced to if its writer failed before
+    storing it, so the chain has no gap. Returns whether one was written.
+    """
+    head = head or audit_chain.find_one({"_id": "head"})
+    if not (head and head.get("pending")):
+        return False
+    written = _write_entry(head["pending"])
+    if written:
+        logger.warning(f"Completed audit entry {head['seq']} left pending by a failed writer")
+    return written
+
+
+def record_audit(
+    action: str,
+    item_name: str,
+    old_value: Optional[float],
+    new_value: Optional[float],
+    evidence_blob: Optional[str] = None,
+    timestamp: Optional[datetime] = None,
+    jurisdiction: Optional[str] = None,
+) -> dict:
+    """
+    Append an entry to the audit log.
+
+    The entry is chained to the previous one by hash and written to its
+    monthly partition; the per-item and per-day rollups are updated in the
+    same call. The chain head is advanced together with a copy of the entry,
+    so if writing the entry fails, the next writer (or verify_chain) writes it.
+
+    Returns:
+        The stored entry
+    """
+    # Mongo stores milliseconds, so truncate to keep hashes reproducible on read
+    timestamp = timestamp or datetime.now()
+    timestamp = timestamp.replace(microsecond=timestamp.microsecond // 1000 * 1000)
+
+    while True:
+        head = audit_chain.find_one({"_id": "head"}) or {"seq": 0, "hash": GENESIS_HASH}
+        complete_pending_entry(head)
+        entry = {
+            "seq": head["seq"] + 1,
+            "action": action,
+            "item_name": item_name,
+            "old_value": old_value,
+            "new_value": new_value,
+            "evidence_blob": evidence_blob,
+            "timestamp": timestamp,
+            "prev_hash": head["hash"],
+        }
+        if jurisdiction:
+            entry["jurisdiction"] = jurisdiction
+        entry["hash"] = entry_hash(entry)
+
+        # Advance the chain head only if no other writer advanced it meanwhile
+        try:
+            result = audit_chain.update_one(
+                {"_id": "head", "seq": head["seq"]},
+                {"$set": {"seq": entry["seq"], "hash": entry["hash"], "pending": entry}},
+                upsert=head["seq"] == 0,
+            )
+        except DuplicateKeyError:
+            continue
+        if result.matched_count or result.upserted_id:
+            break
+
+    _write_entry(entry)
+    return entry
+
+
+def find_audit_logs(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    item_name: Optional[str] = None,
+    limit: Optional[int] = None,
+    projection: Optional[dict] = None,
+    jurisdiction: Optional[str] = None,
+    before: Optional[tuple[datetime, int]] = None,
+) -> Iterator[dict]:
+    """
+    Audit entries newest first, reading only the partitions in the time range.
+
+    Stops opening older partitions once `limit` entries have been returned.
+    `before` is the (timestamp, seq) of the last entry of the previous page;
+    only older entries are returned.
+    """
+    query = {}
+    if since or until:
+        query["timestamp"] = {}
+        if since:
+            query["timestamp"]["$gte"] = since
+        if until:
+            query["timestamp"]["$lte"] = until
+    if item_name:
+        query["item_name"] = item_name
+    if jurisdiction:
+        query["jurisdiction"] = jurisdiction
+    if before:
+        before_timestamp, before_seq = before
+        query["$or"] = [
+            {"timestamp": {"$lt": before_timestamp}},
+            {"timestamp": before_timestamp, "seq": {"$lt": before_seq}},
+        ]
+        until = min(until, before_timestamp) if until else before_timestamp
+
+    remaining = limit
+    for name in list_partitions(since, until):
+        cursor = db[name].find(query, projection).sort([("timestamp", DESCENDING), ("seq", DESCENDING)])
+        if remaining is not None:
+            cursor = cursor.limit(remaining)
+        for entry in cursor:
+            yield entry
+            if remaining is not None:
+                remaining -= 1
+        if remaining == 0:
+            return
+
+
+def distinct_audit_values(field: str) -> set:
+    """Distinct values of a field across all partitions."""
+    values = set()
+    for name in list_partitions():
+        values |= set(db[name].distinct(field))
+    return values
+
+
+def verify_chain() -> dict:
+    """
+    Recompute the hash chain over all partitions in sequence order.
+
+    Returns:
+        {"ok": bool, "entries": entries checked, "first_bad_seq": seq of the
+        first missing or altered entry, or None}
+    """
+    complete_pending_entry()
+
+    # Migrated history can put older timestamps after newer ones in the chain,
+    # so merge the partitions by seq rather than walking them by month
+    entries = heapq.merge(
+        *(db[name].find().sort("seq", ASCENDING) for name in list_partitions()),
+        key=lambda entry: entry["seq"],
+    )
+    expected_prev, expected_seq, checked = GENESIS_HASH, 1, 0
+    for entry in entries:
+        if entry["seq"] != expected_seq or entry["prev_hash"] != expected_prev or entry["hash"] != entry_hash(entry):
+            return {"ok": False, "entries": checked, "first_bad_seq": expected_seq}
+        expected_prev, expected_seq, checked = entry["hash"], expected_seq + 1, checked + 1
+
+    head = audit_chain.find_one({"_id": "head"})
+    if head and head["seq"] != checked:
+        return {"ok": False, "entries": checked, "first_bad_seq": expected_seq}
+    return {"ok": True, "entries": checked, "first_bad_seq": None}
+
+
+def rebuild_item_rollups() -> int:
+    """
+    Recount the per-item rollups from all partitions, replacing the existing
+    ones. Returns the number of rollups written.
+    """
+    rollups: dict[tuple, dict] = {}
+    for name in list_partitions():
+        for entry in db[name].find({}, {"_id": 0, "jurisdiction": 1, "item_name": 1, "action": 1, "timestamp": 1}):
+            key = rollup_item_key(entry["item_name"], entry.get("jurisdiction"))
+            rollup = rollups.setdefault(
+                (key["jurisdiction"], key["item"]),
+                {"_id": key, "total": 0, "actions": {}, "last_timestamp": entry["timestamp"]},
+            )
+            rollup["total"] += 1
+            rollup["actions"][entry["action"]] = rollup["actions"].get(entry["action"], 0) + 1
+            rollup["last_timestamp"] = max(rollup["last_timestamp"], entry["timestamp"])
+
+    audit_rollup_items.delete_many({})
+    if rollups:
+        audit_rollup_items.insert_many(list(rollups.values()))
+    return len(rollups)
+
+
+def migrate_legacy_audit_logs() -> int:
+    """
+    Move entries from the single legacy audit_logs collection into the
+    chained monthly partitions, oldest first. Returns the number migrated.
+    """
+    migrated = 0
+    for legacy in audit_logs.find().sort("timestamp", ASCENDING):
+        record_audit(
+            action=legacy["action"],
+            item_name=legacy["item_name"],
+            old_value=legacy.get("old_value"),
+            new_value=legacy.get("new_value"),
+            evidence_blob=legacy.get("evidence_blob"),
+            timestamp=legacy["timestamp"],
+            jurisdiction=legacy.get("jurisdiction"),
+        )
+        audit_logs.delete_one({"_id": legacy["_id"]})
+        migrated += 1
+    return migrated
@@ -0,0 +1,64 @@
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+from core.db import tax_schemes
+
+try:
+    from config import DEFAULT_JURISDICTION, JURISDICTION_SOURCES, CATALOG_CACHE_TTL
+except ImportError:
+    DEFAULT_JURISDICTION = "GST"
+    JURISDICTION_SOURCES = {}
+    CATALOG_CACHE_TTL = 30  # seconds
+
+_cache: dict[str, tuple[float, dict[str, float]]] = {}
+_generation = {"value": 0}
+_lock = threading.Lock()
+
+
+def jurisdiction_for_url(url: str) -> str:
+    """Jurisdiction a source publishes for, from JURISDICTION_SOURCES by host (or a parent domain)."""
+    host = urlsplit(url).netloc.lower()
+    for source, jurisdiction in JURISDICTION_SOURCES.items():
+        if host == source or host.endswith("." + source):
+            return jurisdiction
+    return DEFAULT_JURISDICTION
+
+
+def get_catalog(jurisdiction: str = DEFAULT_JURISDICTION) -> dict[str, float]:
+    """
+    Current rate per item in one jurisdiction's catalog.
+
+    Only that jurisdiction's schemes are read, and the result is cached for
+    CATALOG_CACHE_TTL seconds so repeated analyses of one source reuse it.
+    """
+    with _lock:
+        cached = _cache.get(jurisdiction)
+        if cached and time.monotonic() < cached[0]:
+            return cached[1]
+        generation = _generation["value"]
+
+    catalog = {
+        scheme["item_name"]: scheme["tax_percentage"]
+        for scheme in tax_schemes.find(
+            {"jurisdiction": jurisdiction},
+            {"_id": 0, "item_name": 1, "tax_percentage": 1},
+        )
+    }
+    with _lock:
+        # Don't cache a catalog that a concurrent write has already invalidated
+        if _generation["value"] == generation:
+            _cache[jurisdiction] = (time.monotonic() + CATALOG_CACHE_TTL, catalog)
+    return catalog
+
+
+def get_rate(item_name: str, jurisdiction: str = DEFAULT_JURISDICTION) -> Optional[float]:
+    """Current rate of an item in a jurisdiction, None if the item is not in its catalog."""
+    return get_catalog(jurisdiction).get(item_name)
+
+
+def invalidate_catalog():
+    """Drop cached catalogs; call after writes to tax_schemes."""
+    with _lock:
+        _cache.clear()
+        _generation["value"] += 1
@@ -1,6 +1,4 @@
 from pymongo import MongoClient
-from datetime import datetime
-from typing import Optional
 import sys
 from pathlib import Path
 
@@ -14,31 +12,16 @@ except ImportError:
     MONGO_URI = "mongodb://localhost:27017"
     DB_NAME = "lexaudit_flow"
 
-client = MongoClient(MONGO_URI)
+# connect=False defers the connection until the first operation, so importing
+# this module does not block on MongoDB
+client = MongoClient(MONGO_URI, connect=False)
 db = client[DB_NAME]
 
 # Collections
 tax_schemes = db["tax_schemes"]
 pending_updates = db["pending_updates"]
-audit_logs = db["audit_logs"]
-
-# Create indexes
-def init_db():
-    """Initialize database indexes"""
-    tax_schemes.create_index("item_name", unique=True)
-    pending_updates.create_index("status")
-    audit_logs.create_index("timestamp")
-    print("Database initialized successfully")
-
-# Sample data initialization
-def seed_database():
-    """Seed database with sample tax schemes"""
-    if tax_schemes.count_documents({}) == 0:
-        sample_data = [
-            {"item_name": "Mobile Phones", "tax_percentage": 18.0, "last_updated": datetime.now()},
-            {"item_name": "Laptops", "tax_percentage": 18.0, "last_updated": datetime.now()},
-            {"item_name": "Tablets", "tax_percentage": 12.0, "last_updated": datetime.now()},
-            {"item_name": "Software", "tax_percentage": 18.0, "last_updated": datetime.now()},
-        ]
-        tax_schemes.insert_many(sample_data)
-        print("Sample data seeded")
+audit_logs = db["audit_logs"]  # legacy, unpartitioned; see core/audit.py
+audit_chain = db["audit_chain"]
+audit_rollup_items = db["audit_rollup_items"]
+audit_rollup_daily = db["audit_rollup_daily"]
+crawl_pages = db["crawl_pages"]
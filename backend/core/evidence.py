@@ -0,0 +1,228 @@
+import hashlib
+import logging
+import re
+import tempfile
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Optional
+
+try:
+    from config import (
+        EVIDENCE_BACKEND,
+        EVIDENCE_S3_BUCKET,
+        EVIDENCE_S3_PREFIX,
+        EVIDENCE_S3_ENDPOINT_URL,
+        EVIDENCE_GC_GRACE_HOURS,
+    )
+except ImportError:
+    EVIDENCE_BACKEND = "local"
+    EVIDENCE_S3_BUCKET = "lexaudit-evidence"
+    EVIDENCE_S3_PREFIX = "blobs/"
+    EVIDENCE_S3_ENDPOINT_URL = None
+    EVIDENCE_GC_GRACE_HOURS = 24
+
+logger = logging.getLogger(__name__)
+
+EVIDENCE_DIR = Path(__file__).parent.parent / "evidence"
+BLOB_KEY_PATTERN = re.compile(r"^[0-9a-f]{64}\.(pdf|png)$")
+MEDIA_TYPES = {"pdf": "application/pdf", "png": "image/png"}
+
+
+def blob_key(data: bytes, extension: str = "pdf") -> str:
+    """Content address of a blob: sha256 of its bytes plus extension."""
+    return f"{hashlib.sha256(data).hexdigest()}.{extension}"
+
+
+def is_blob_key(value: Optional[str]) -> bool:
+    return bool(value and BLOB_KEY_PATTERN.match(value))
+
+
+def media_type(key: str) -> str:
+    return MEDIA_TYPES[key.rsplit(".", 1)[-1]]
+
+
+class LocalEvidenceStore:
+    """Content-addressed blobs (PDFs and their rendered images) in a local directory, fanned out by key prefix."""
+
+    def __init__(self, root: Path = EVIDENCE_DIR / "blobs"):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        if not is_blob_key(key):
+            raise ValueError(f"Invalid evidence key: {key}")
+        return self.root / key[:2] / key
+
+    def put_bytes(self, data: bytes, extension: str = "pdf") -> str:
+        """Store a blob, returning its key. Storing the same bytes again keeps a single copy."""
+        key = blob_key(data, extension)
+        path = self._path(key)
+        if path.exists():
+            # Refresh the modification time so garbage collection keeps it for the grace period
+            path.touch()
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # A temp file per writer: concurrent writers of the same content each
+            # replace the blob with identical bytes instead of racing on one temp file
+            with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as tmp:
+                tmp.write(data)
+            try:
+                Path(tmp.name).replace(path)
+            except BaseException:
+                Path(tmp.name).unlink(missing_ok=True)
+                raise
+        return key
+
+    def put_file(self, file_path: str) -> str:
+        return self.put_bytes(Path(file_path).read_bytes())
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def get_bytes(self, key: str) -> bytes:
+        return self._path(key).read_bytes()
+
+    def local_path(self, key: str) -> str:
+        """Path of a readable local copy, for tools like PyMuPDF that open files."""
+        return str(self._path(key))
+
+    def delete(self, key: str):
+        self._path(key).unlink(missing_ok=True)
+
+    def list_blobs(self) -> Iterator[tuple[str, datetime]]:
+        """Yield (key, last modified) for every stored blob."""
+        for path in self.root.glob("*/*.*"):
+            if is_blob_key(path.name):
+                yield path.name, datetime.fromtimestamp(path.stat().st_mtime)
+
+
+class S3EvidenceStore:
+    """
+    Content-addressed blobs in an S3-compatible bucket.
+
+    Set EVIDENCE_S3_ENDPOINT_URL to use a local stand-in such as MinIO.
+    Blobs are cached on local disk when opened with `local_path`.
+    """
+
+    def __init__(
+        self,
+        bucket: str = EVIDENCE_S3_BUCKET,
+        prefix: str = EVIDENCE_S3_PREFIX,
+        endpoint_url: Optional[str] = EVIDENCE_S3_ENDPOINT_URL,
+        cache: Optional[LocalEvidenceStore] = None,
+    ):
+        import boto3
+
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+        self.bucket = bucket
+        self.prefix = prefix
+        self.cache = cache or LocalEvidenceStore(EVIDENCE_DIR / "cache")
+
+    def _object_key(self, key: str) -> str:
+        if not is_blob_key(key):
+            raise ValueError(f"Invalid evidence key: {key}")
+        return self.prefix + key
+
+    def put_bytes(self, data: bytes, extension: str = "pdf") -> str:
+        key = blob_key(data, extension)
+        # Always written (content addressing makes this idempotent) so LastModified
+        # is refreshed for the garbage collection grace period
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self._object_key(key),
+            Body=data,
+            ContentType=media_type(key),
+        )
+        self.cache.put_bytes(data, extension)
+        return key
+
+    def put_file(self, file_path: str) -> str:
+        return self.put_bytes(Path(file_path).read_bytes())
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+            return True
+        except ClientError:
+            return False
+
+    def get_bytes(self, key: str) -> bytes:
+        if self.cache.exists(key):
+            return self.cache.get_bytes(key)
+        response = self.client.get_object(Bucket=self.bucket, Key=self._object_key(key))
+        return response["Body"].read()
+
+    def local_path(self, key: str) -> str:
+        if not self.cache.exists(key):
+            self.cache.put_bytes(self.get_bytes(key), key.rsplit(".", 1)[-1])
+        return self.cache.local_path(key)
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+        self.cache.delete(key)
+
+    def list_blobs(self) -> Iterator[tuple[str, datetime]]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for obj in page.get("Contents", []):
+                yield obj["Key"][len(self.prefix):], obj["LastModified"].astimezone().replace(tzinfo=None)
+
+
+@lru_cache(maxsize=1)
+def get_evidence_store():
+    """Evidence store selected by EVIDENCE_BACKEND ("local" or "s3")."""
+    if EVIDENCE_BACKEND == "s3":
+        return S3EvidenceStore()
+    return LocalEvidenceStore()
+
+
+def collect_garbage(dry_run: bool = False, grace_hours: float = EVIDENCE_GC_GRACE_HOURS) -> dict:
+    """
+    Delete evidence no longer referenced by any pending update or audit entry.
+
+    Crawled documents whose analysis has not completed are kept until it does,
+    and blobs newer than `grace_hours` are kept so documents that are still
+    being analyzed are not removed. Legacy per-file copies in evidence/raw and
+    evidence/highlighted are collected the same way.
+
+    Returns:
+        Counts of kept and removed blobs and legacy files
+    """
+    from core.audit import distinct_audit_values
+    from core.db import pending_updates, audit_logs, crawl_pages
+
+    referenced = set()
+    for field in ("evidence_blob", "evidence_rendered", "evidence_snippet", "evidence_thumbnail"):
+        referenced |= set(pending_updates.distinct(field))
+    referenced |= distinct_audit_values("evidence_blob")
+    referenced |= set(audit_logs.distinct("evidence_blob"))  # not yet migrated
+    # Retried by the next crawl of their source
+    referenced |= set(crawl_pages.distinct("blob", {"kind": "document", "analyzed": False}))
+    referenced_files = {Path(p).name for p in pending_updates.distinct("evidence_pdf_path") if p}
+    cutoff = datetime.now() - timedelta(hours=grace_hours)
+
+    stats = {"blobs_kept": 0, "blobs_removed": 0, "legacy_kept": 0, "legacy_removed": 0}
+    store = get_evidence_store()
+    for key, modified in list(store.list_blobs()):
+        if key in referenced or modified > cutoff:
+            stats["blobs_kept"] += 1
+            continue
+        logger.info(f"Removing unreferenced evidence blob {key}")
+        if not dry_run:
+            store.delete(key)
+        stats["blobs_removed"] += 1
+
+    for folder in ("raw", "highlighted"):
+        for path in (EVIDENCE_DIR / folder).glob("*.pdf"):
+            modified = datetime.fromtimestamp(path.stat().st_mtime)
+            if path.name in referenced_files or modified > cutoff:
+                stats["legacy_kept"] += 1
+                continue
+            logger.info(f"Removing unreferenced evidence file {path}")
+            if not dry_run:
+                path.unlink(missing_ok=True)
+            stats["legacy_removed"] += 1
+
+    return stats
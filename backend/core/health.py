@@ -0,0 +1,200 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+import httpx
+import pymongo
+from core.db import client
+
+try:
+    from config import (
+        OLLAMA_BASE_URL,
+        OLLAMA_MODEL,
+        OLLAMA_KEEP_ALIVE,
+        OLLAMA_PREWARM,
+        OLLAMA_TIMEOUT,
+        HEALTH_CACHE_TTL,
+        HEALTH_PROBE_TIMEOUT,
+        MONGO_SLOW_PING_MS,
+        BROWSER_PROBE_TTL,
+    )
+except ImportError:
+    OLLAMA_BASE_URL = "http://localhost:11434"
+    OLLAMA_MODEL = "llama2"
+    OLLAMA_KEEP_ALIVE = "30m"
+    OLLAMA_PREWARM = True
+    OLLAMA_TIMEOUT = 300
+    HEALTH_CACHE_TTL = 5  # seconds
+    HEALTH_PROBE_TIMEOUT = 2  # seconds
+    MONGO_SLOW_PING_MS = 100
+    BROWSER_PROBE_TTL = 300  # seconds
+
+logger = logging.getLogger(__name__)
+
+# Backends a crawl/analysis job cannot run without; the browser is optional
+# because crawls can fall back to static fetching
+REQUIRED = ("mongo", "ollama")
+# Backends the API needs to serve reads; only these fail readiness, so an
+# outage of the model server does not take read-only instances out of rotation
+SERVING = ("mongo",)
+# Probed only when a crawl is dispatched, never from readiness: launching
+# Chromium is slow, and read-only instances need no browser
+ON_DISPATCH = ("browser",)
+
+_results: dict[str, tuple[float, dict]] = {}
+_warming: dict[str, Optional[asyncio.Task]] = {"task": None}
+
+
+def _model_name(name: str) -> str:
+    return name if ":" in name else f"{name}:latest"
+
+
+def _ping_mongo():
+    # Bounds server selection too, so the worker thread does not outlive the probe
+    with pymongo.timeout(HEALTH_PROBE_TIMEOUT):
+        client.admin.command("ping")
+
+
+async def probe_mongo() -> dict:
+    """Ping MongoDB and report the round trip."""
+    started = time.perf_counter()
+    await asyncio.to_thread(_ping_mongo)
+    latency_ms = (time.perf_counter() - started) * 1000
+    return {
+        "status": "degraded" if latency_ms > MONGO_SLOW_PING_MS else "ok",
+        "latency_ms": round(latency_ms, 1),
+    }
+
+
+async def probe_ollama() -> dict:
+    """Check that the model server is up, the model is pulled, and whether it is loaded in memory."""
+    model = _model_name(OLLAMA_MODEL)
+    async with httpx.AsyncClient(base_url=OLLAMA_BASE_URL, timeout=HEALTH_PROBE_TIMEOUT) as http:
+        tags = await http.get("/api/tags")
+        tags.raise_for_status()
+        if model not in {_model_name(m["name"]) for m in tags.json().get("models", [])}:
+            return {"status": "unavailable", "model": model, "error": "model not pulled"}
+
+        running = await http.get("/api/ps")
+        loaded = running.is_success and model in {
+            _model_name(m["name"]) for m in running.json().get("models", [])
+        }
+
+    return {"status": "ok", "model": model, "loaded": loaded, "warming": is_warming()}
+
+
+async def probe_browser() -> dict:
+    """Launch and close headless Chromium."""
+    from playwright.async_api import async_playwright
+
+    started = time.perf_counter()
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        await browser.close()
+    return {"status": "ok", "launch_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+
+PROBES = {
+    "mongo": (probe_mongo, HEALTH_CACHE_TTL, HEALTH_PROBE_TIMEOUT),
+    "ollama": (probe_ollama, HEALTH_CACHE_TTL, HEALTH_PROBE_TIMEOUT * 2),
+    # Launching Chromium takes a second or more, so it is re-checked less often
+    "browser": (probe_browser, BROWSER_PROBE_TTL, HEALTH_PROBE_TIMEOUT * 5),
+}
+
+
+async def check_backend(name: str, force: bool = False) -> dict:
+    """
+    Probe result of one backend, reused for its cache TTL.
+
+    Returns:
+        {"status": "ok" | "degraded" | "unavailable", "checked_at": epoch seconds, ...}
+        with probe-specific details, or "error" when unavailable
+    """
+    probe, ttl, timeout = PROBES[name]
+    cached = _results.get(name)
+    if cached and not force and time.monotonic() < cached[0]:
+        return cached[1]
+
+    try:
+        result = await asyncio.wait_for(probe(), timeout=timeout)
+    except asyncio.TimeoutError:
+        result = {"status": "unavailable", "error": f"no response within {timeout}s"}
+    except Exception as e:
+        result = {"status": "unavailable", "error": str(e) or type(e).__name__}
+    if result["status"] == "unavailable":
+        logger.warning(f"Health check failed for {name}: {result.get('error')}")
+
+    result["checked_at"] = time.time()
+    _results[name] = (time.monotonic() + ttl, result)
+    return result
+
+
+async def check_health(force: bool = False) -> dict:
+    """
+    Probe MongoDB and the model server concurrently; the browser is reported
+    as of its last dispatch-time probe ("unchecked" if there was none).
+
+    Returns:
+        {"status": "ok" | "degraded" | "unavailable", "checks": {backend: result}};
+        "unavailable" if MongoDB is down, "degraded" if another backend is down
+        or any backend is slow
+    """
+    names = [name for name in PROBES if name not in ON_DISPATCH]
+    results = await asyncio.gather(*(check_backend(name, force) for name in names))
+    checks = dict(zip(names, results))
+    for name in ON_DISPATCH:
+        cached = _results.get(name)
+        checks[name] = cached[1] if cached else {"status": "unchecked"}
+
+    if any(checks[name]["status"] == "unavailable" for name in SERVING):
+        status = "unavailable"
+    elif any(check["status"] in ("degraded", "unavailable") for check in checks.values()):
+        status = "degraded"
+    else:
+        status = "ok"
+    return {"status": status, "checks": checks}
+
+
+async def backend_available(name: str) -> bool:
+    """Whether work depending on a backend should be dispatched to it now."""
+    return (await check_backend(name))["status"] != "unavailable"
+
+
+def mark_unavailable(name: str, error: str):
+    """Record a backend failure seen by a job, so other jobs skip it until the next probe."""
+    _, ttl, _ = PROBES[name]
+    _results[name] = (
+        time.monotonic() + min(ttl, HEALTH_CACHE_TTL),
+        {"status": "unavailable", "error": error, "checked_at": time.time()},
+    )
+
+
+async def warm_model():
+    """Load the model into memory ahead of the first analysis, keeping it loaded for OLLAMA_KEEP_ALIVE."""
+    try:
+        async with httpx.AsyncClient(base_url=OLLAMA_BASE_URL, timeout=OLLAMA_TIMEOUT) as http:
+            response = await http.post(
+                "/api/generate",
+                json={"model": OLLAMA_MODEL, "prompt": "", "keep_alive": OLLAMA_KEEP_ALIVE},
+            )
+            response.raise_for_status()
+        logger.info(f"Model {OLLAMA_MODEL} loaded")
+    except Exception as e:
+        logger.warning(f"Could not pre-warm model {OLLAMA_MODEL}: {e}")
+
+
+def is_warming() -> bool:
+    task = _warming["task"]
+    return task is not None and not task.done()
+
+
+def start_warming() -> Optional[asyncio.Task]:
+    """Start loading the model in the background unless a load is already in progress."""
+    if not is_warming():
+        _warming["task"] = asyncio.get_running_loop().create_task(warm_model())
+    return _warming["task"]
+
+
+def stop_warming():
+    if is_warming():
+        _warming["task"].cancel()
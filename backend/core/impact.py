@@ -0,0 +1,170 @@
+import csv
+import logging
+import threading
+from pathlib import Path
+from typing import Optional
+import numpy as np
+
+try:
+    from config import TRANSACTIONS_PATH, DEFAULT_JURISDICTION
+except ImportError:
+    TRANSACTIONS_PATH = "data/transactions.npz"
+    DEFAULT_JURISDICTION = "GST"
+
+# Relative paths are resolved against the backend directory
+TRANSACTIONS_PATH = str(Path(__file__).parent.parent / TRANSACTIONS_PATH)
+
+logger = logging.getLogger(__name__)
+
+_engine = {"value": None, "mtime": None}
+_lock = threading.Lock()
+
+
+def import_transactions(csv_path: str, output_path: str = TRANSACTIONS_PATH) -> int:
+    """
+    Convert a transaction CSV into the columnar file the impact engine loads.
+
+    The CSV needs `item_name`, `quantity` and `unit_price` (net of tax) columns,
+    one row per line item, and optionally a `jurisdiction` column (rows without
+    one belong to DEFAULT_JURISDICTION).
+
+    Returns:
+        Number of line items imported
+    """
+    items: dict[tuple[str, str], int] = {}
+    codes, quantities, prices = [], [], []
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            key = ((row.get("jurisdiction") or DEFAULT_JURISDICTION).strip(), row["item_name"].strip())
+            codes.append(items.setdefault(key, len(items)))
+            quantities.append(float(row["quantity"]))
+            prices.append(float(row["unit_price"]))
+
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "wb") as f:
+        np.savez(
+            f,
+            item_jurisdictions=np.array([jurisdiction for jurisdiction, _ in items], dtype=str),
+            item_names=np.array([name for _, name in items], dtype=str),
+            item_codes=np.array(codes, dtype=np.int32),
+            quantity=np.array(quantities, dtype=np.float64),
+            unit_price=np.array(prices, dtype=np.float64),
+        )
+    _engine["value"] = None
+    logger.info(f"Imported {len(codes)} line items for {len(items)} items into {output_path}")
+    return len(codes)
+
+
+class ImpactEngine:
+    """
+    Revenue and price impact of rate changes over the imported line items.
+
+    Items are identified by (jurisdiction, item name), since jurisdictions
+    catalog overlapping item names.
+
+    Tax revenue is linear in the rate, so per-item totals are aggregated once
+    with vectorized bincounts when the engine is built; simulating any set of
+    rate changes afterwards only touches the affected items.
+    """
+
+    def __init__(
+        self,
+        item_jurisdictions: np.ndarray,
+        item_names: np.ndarray,
+        item_codes: np.ndarray,
+        quantity: np.ndarray,
+        unit_price: np.ndarray,
+    ):
+        n_items = len(item_names)
+        self.index = {key: i for i, key in enumerate(zip(item_jurisdictions.tolist(), item_names.tolist()))}
+        self.total_line_items = len(item_codes)
+        self.line_items = np.bincount(item_codes, minlength=n_items)
+        self.quantity = np.bincount(item_codes, weights=quantity, minlength=n_items)
+        self.net_sales = np.bincount(item_codes, weights=quantity * unit_price, minlength=n_items)
+
+    @classmethod
+    def load(cls, path: str = TRANSACTIONS_PATH) -> "ImpactEngine":
+        with np.load(path) as data:
+            names = data["item_names"]
+            if "item_jurisdictions" in data:
+                jurisdictions = data["item_jurisdictions"]
+            else:
+                # Imported before jurisdictions were tracked
+                jurisdictions = np.full(len(names), DEFAULT_JURISDICTION)
+            return cls(jurisdictions, names, data["item_codes"], data["quantity"], data["unit_price"])
+
+    def simulate(self, changes: list[dict], current_rates: dict[tuple[str, str], float]) -> dict:
+        """
+        Simulate rate changes.
+
+        Args:
+            changes: Dicts with "id", "jurisdiction", "item" and "new_rate"; when
+                several change the same item, the last one wins in the combined totals
+            current_rates: Current rate per (jurisdiction, item) from the catalogs;
+                items missing from them are simulated from 0% and reported with
+                current_rate None
+
+        Returns:
+            Per-change impact and the combined totals of applying all changes
+        """
+        keys = [(change["jurisdiction"], change["item"]) for change in changes]
+        idx = np.array([self.index.get(key, -1) for key in keys], dtype=np.int64)
+        known = idx >= 0
+        safe_idx = np.where(known, idx, 0)
+        current = np.array([current_rates.get(key, np.nan) for key in keys], dtype=np.float64)
+        new = np.array([change["new_rate"] for change in changes], dtype=np.float64)
+        # An item not in the catalog yet is untaxed until its rate is accepted
+        current_or_zero = np.nan_to_num(current)
+        delta = new - current_or_zero
+
+        net_sales = np.where(known, self.net_sales[safe_idx], 0.0)
+        quantity = np.where(known, self.quantity[safe_idx], 0.0)
+        line_items = np.where(known, self.line_items[safe_idx], 0)
+        revenue_before = net_sales * current_or_zero / 100
+        revenue_delta = net_sales * delta / 100
+        avg_price = np.divide(net_sales, quantity, out=np.zeros_like(net_sales), where=quantity > 0)
+        price_delta = avg_price * delta / 100
+
+        results = []
+        for i, change in enumerate(changes):
+            results.append({
+                "update_id": change.get("id"),
+                "jurisdiction": change["jurisdiction"],
+                "item": change["item"],
+                "current_rate": None if np.isnan(current[i]) else float(current[i]),
+                "new_rate": float(new[i]),
+                "line_items": int(line_items[i]),
+                "net_sales": float(net_sales[i]),
+                "revenue_before": float(revenue_before[i]),
+                "revenue_after": float(revenue_before[i] + revenue_delta[i]),
+                "revenue_delta": float(revenue_delta[i]),
+                "avg_price_delta_per_unit": float(price_delta[i]),
+            })
+
+        # Combined: one change per item, the last one given
+        last_per_item = {key: i for i, key in enumerate(keys)}
+        combined = list(last_per_item.values())
+        return {
+            "updates": results,
+            "combined": {
+                "items": len(combined),
+                "line_items": int(line_items[combined].sum()),
+                "revenue_before": float(revenue_before[combined].sum()),
+                "revenue_delta": float(revenue_delta[combined].sum()),
+            },
+            "catalog_line_items": self.total_line_items,
+        }
+
+
+def get_impact_engine() -> Optional[ImpactEngine]:
+    """Engine over the imported transactions, reloaded when the file changes. None if nothing was imported."""
+    path = Path(TRANSACTIONS_PATH)
+    if not path.exists():
+        return None
+
+    mtime = path.stat().st_mtime
+    with _lock:
+        if _engine["value"] is None or _engine["mtime"] != mtime:
+            _engine["value"] = ImpactEngine.load(str(path))
+            _engine["mtime"] = mtime
+        return _engine["value"]
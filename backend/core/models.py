@@ -24,6 +24,7 @@ class PyObjectId(ObjectId):
 # Database Models
 class TaxScheme(BaseModel):
     id: Optional[PyObjectId] = Field(alias="_id")
+    jurisdiction: str = "GST"
     item_name: str
     tax_percentage: float
     last_updated: datetime = Field(default_factory=datetime.now)
@@ -34,6 +35,7 @@ class TaxScheme(BaseModel):
 
 class PendingUpdate(BaseModel):
     id: Optional[PyObjectId] = Field(alias="_id")
+    jurisdiction: str = "GST"
     detected_item: str
     current_db_val: float
     new_web_val: float
@@ -49,12 +51,16 @@ class PendingUpdate(BaseModel):
 
 class AuditLog(BaseModel):
     id: Optional[PyObjectId] = Field(alias="_id")
+    seq: int
     action: str
+    jurisdiction: Optional[str] = None  # absent on entries written before jurisdictions
     item_name: str
-    old_value: float
-    new_value: float
+    old_value: Optional[float] = None
+    new_value: Optional[float] = None
+    evidence_blob: Optional[str] = None
     timestamp: datetime = Field(default_factory=datetime.now)
-    manager_id: Optional[str] = None
+    prev_hash: str
+    hash: str
 
     class Config:
         populate_by_name = True
@@ -65,19 +71,55 @@ class UpdateAcceptRequest(BaseModel):
     accept: bool
 
 
+class ImpactRequest(BaseModel):
+    update_ids: list[str] = Field(default_factory=list)  # empty: all pending updates
+
+
 class UpdateResponse(BaseModel):
     id: str
+    jurisdiction: Optional[str] = None
     detected_item: str
-    current_db_val: float
+    current_db_val: Optional[float] = None
     new_web_val: float
     evidence_pdf_path: str
     evidence_quote: str
+    evidence_page: Optional[int] = None  # 1-based
     status: str
     created_at: datetime
 
 
+class AuditLogResponse(BaseModel):
+    id: str
+    action: str
+    jurisdiction: Optional[str] = None
+    item_name: str
+    old_value: Optional[float] = None
+    new_value: Optional[float] = None
+    timestamp: datetime
+    seq: int
+    hash: str
+
+
+def response_projection(model: type[BaseModel], **computed) -> dict:
+    """
+    Find projection that returns documents already shaped like a response model.
+
+    `id` is the stringified `_id`; other fields are included as stored unless
+    given as an aggregation expression in `computed`. Rows decoded from the
+    cursor can then be serialized as they are, without per-row conversion.
+    """
+    projection = {"_id": 0}
+    for name in model.model_fields:
+        projection[name] = 1
+    if "id" in model.model_fields:
+        projection["id"] = {"$toString": "$_id"}
+    projection.update(computed)
+    return projection
+
+
 class AnalysisResult(BaseModel):
     change_detected: bool
     item: Optional[str] = None
     new_val: Optional[float] = None
     quote: Optional[str] = None
+    update_id: Optional[str] = None
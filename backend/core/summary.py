@@ -0,0 +1,127 @@
+import threading
+import time
+from datetime import datetime
+from core.db import pending_updates, crawl_pages
+
+try:
+    from config import SUMMARY_CACHE_TTL
+except ImportError:
+    SUMMARY_CACHE_TTL = 10  # seconds
+
+_cache = {"value": None, "expires": 0.0, "generation": 0}
+_lock = threading.Lock()
+
+PENDING_FACETS = [
+    {
+        "$facet": {
+            "pending_by_item": [
+                {"$match": {"status": "pending"}},
+                {"$group": {"_id": {"jurisdiction": "$jurisdiction", "item": "$detected_item"}, "count": {"$sum": 1}}},
+                {"$sort": {"count": -1, "_id.jurisdiction": 1, "_id.item": 1}},
+            ],
+            "status_counts": [
+                {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+            ],
+            "latest_by_item": [
+                {"$sort": {"created_at": -1}},
+                {
+                    "$group": {
+                        # Catalogs share item names, so items are told apart by jurisdiction
+                        "_id": {"jurisdiction": "$jurisdiction", "item": "$detected_item"},
+                        "id": {"$first": {"$toString": "$_id"}},
+                        "current_db_val": {"$first": "$current_db_val"},
+                        "new_web_val": {"$first": "$new_web_val"},
+                        "status": {"$first": "$status"},
+                        "created_at": {"$first": "$created_at"},
+                    }
+                },
+                {"$sort": {"created_at": -1}},
+            ],
+        }
+    }
+]
+
+CRAWL_FRESHNESS = [
+    {
+        "$group": {
+            "_id": "$source",
+            "last_crawled": {"$max": "$last_crawled"},
+            "pages": {"$sum": {"$cond": [{"$eq": ["$kind", "page"]}, 1, 0]}},
+            "documents": {"$sum": {"$cond": [{"$eq": ["$kind", "document"]}, 1, 0]}},
+        }
+    },
+    {"$sort": {"last_crawled": -1}},
+]
+
+
+def _isoformat(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def compute_summary() -> dict:
+    """Compute dashboard counts with one $facet over pending_updates and one group over crawl_pages."""
+    facets = next(pending_updates.aggregate(PENDING_FACETS))
+    status_counts = {row["_id"]: row["count"] for row in facets["status_counts"]}
+    accepted = status_counts.get("accepted", 0)
+    rejected = status_counts.get("rejected", 0)
+    decided = accepted + rejected
+
+    return {
+        "pending_total": status_counts.get("pending", 0),
+        "pending_by_item": [
+            {"jurisdiction": row["_id"]["jurisdiction"], "item": row["_id"]["item"], "count": row["count"]}
+            for row in facets["pending_by_item"]
+        ],
+        "decisions": {
+            "accepted": accepted,
+            "rejected": rejected,
+            "accept_rate": accepted / decided if decided else None,
+            "reject_rate": rejected / decided if decided else None,
+        },
+        "latest_by_item": [
+            {
+                "jurisdiction": row["_id"]["jurisdiction"],
+                "item": row["_id"]["item"],
+                "id": row["id"],
+                "current_db_val": row["current_db_val"],
+                "new_web_val": row["new_web_val"],
+                "status": row["status"],
+                "created_at": _isoformat(row["created_at"]),
+            }
+            for row in facets["latest_by_item"]
+        ],
+        "crawl_freshness": [
+            {
+                "source": row["_id"],
+                "last_crawled": _isoformat(row["last_crawled"]),
+                "pages": row["pages"],
+                "documents": row["documents"],
+            }
+            for row in crawl_pages.aggregate(CRAWL_FRESHNESS)
+        ],
+        "generated_at": datetime.now().isoformat(),
+    }
+
+
+def get_summary() -> dict:
+    """Return the dashboard summary, cached for SUMMARY_CACHE_TTL seconds."""
+    with _lock:
+        if _cache["value"] is not None and time.monotonic() < _cache["expires"]:
+            return _cache["value"]
+        generation = _cache["generation"]
+
+    summary = compute_summary()
+    with _lock:
+        # Don't cache a result that a concurrent write has already invalidated
+        if _cache["generation"] == generation:
+            _cache["value"] = summary
+            _cache["expires"] = time.monotonic() + SUMMARY_CACHE_TTL
+    return summary
+
+
+def invalidate_summary():
+    """Drop the cached summary; call after writes to pending_updates or crawl_pages."""
+    with _lock:
+        _cache["value"] = None
+        _cache["expires"] = 0.0
+        _cache["generation"] += 1
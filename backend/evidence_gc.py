@@ -0,0 +1,39 @@
+"""
+LexAudit Flow - Evidence Garbage Collection
+Removes stored evidence PDFs that no pending update or audit entry references.
+Run periodically (e.g. nightly cron). Use --dry-run to only report what would be removed.
+"""
+
+import argparse
+import logging
+import sys
+
+from config import EVIDENCE_GC_GRACE_HOURS, LOG_FORMAT
+from core.evidence import collect_garbage
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove unreferenced evidence PDFs")
+    parser.add_argument("--dry-run", action="store_true", help="report without deleting")
+    parser.add_argument(
+        "--grace-hours",
+        type=float,
+        default=EVIDENCE_GC_GRACE_HOURS,
+        help="keep evidence younger than this many hours",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    stats = collect_garbage(dry_run=args.dry_run, grace_hours=args.grace_hours)
+
+    verb = "Would remove" if args.dry_run else "Removed"
+    print(f"✅ {verb} {stats['blobs_removed']} blobs, kept {stats['blobs_kept']}")
+    print(f"✅ {verb} {stats['legacy_removed']} legacy files, kept {stats['legacy_kept']}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"\n❌ Evidence garbage collection failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,33 @@
+"""
+LexAudit Flow - Transaction Volume Import
+Loads line-item transaction volumes from a CSV for rate-change impact simulation.
+The CSV needs item_name, quantity and unit_price (net of tax) columns, one row per
+line item, and optionally a jurisdiction column. Re-run whenever new volumes are
+exported; the API picks up the new file.
+"""
+
+import argparse
+import logging
+import sys
+
+from config import LOG_FORMAT
+from core.impact import TRANSACTIONS_PATH, import_transactions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import transaction volumes for impact simulation")
+    parser.add_argument("csv_path", help="CSV with item_name, quantity and unit_price columns")
+    parser.add_argument("--output", default=TRANSACTIONS_PATH, help="where to write the imported volumes")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    count = import_transactions(args.csv_path, args.output)
+    print(f"✅ Imported {count} line items into {args.output}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"\n❌ Transaction import failed: {e}")
+        sys.exit(1)
@@ -1,6 +1,8 @@
 """
 LexAudit Flow - Database Initialization Script
 This script creates and seeds the MongoDB database with collections and sample data.
+It is also the migration command: the API no longer creates indexes or seeds data on
+startup, so run it once per deployment after pulling schema changes. It is idempotent.
 Admin Credentials: Username=Admin, Password=Admin123
 """
 
@@ -11,9 +13,15 @@ import sys
 import getpass
 from bson import ObjectId
 
+from core.audit import migrate_legacy_audit_logs, rebuild_item_rollups, list_partitions as list_audit_partitions
+
 # Database configuration
-MONGO_URI = "mongodb://localhost:27017"
-DB_NAME = "lexaudit_flow"
+try:
+    from config import MONGO_URI, DB_NAME, DEFAULT_JURISDICTION
+except ImportError:
+    MONGO_URI = "mongodb://localhost:27017"
+    DB_NAME = "lexaudit_flow"
+    DEFAULT_JURISDICTION = "GST"
 
 # Admin credentials (can be overridden)
 DEFAULT_ADMIN_USERNAME = "Admin"
@@ -46,7 +54,10 @@ def create_collections(db):
     collections_to_create = [
         "tax_schemes",
         "pending_updates",
-        "audit_logs",
+        "audit_chain",
+        "audit_rollup_items",
+        "audit_rollup_daily",
+        "crawl_pages",
         "users",  # For future authentication
     ]
     
@@ -63,17 +74,47 @@ def create_collections(db):
 def create_indexes(db):
     """Create indexes for better performance"""
     try:
-        # tax_schemes indexes
-        db.tax_schemes.create_index("item_name", unique=True)
-        print("✅ Created index on tax_schemes.item_name")
+        # tax_schemes indexes: one catalog per jurisdiction, item names unique within it
+        if "item_name_1" in db.tax_schemes.index_information():
+            db.tax_schemes.drop_index("item_name_1")
+        db.tax_schemes.create_index([("jurisdiction", 1), ("item_name", 1)], unique=True)
+        print("✅ Created index on tax_schemes (jurisdiction, item_name)")
         
         # pending_updates indexes
         db.pending_updates.create_index("status")
         print("✅ Created index on pending_updates.status")
+        db.pending_updates.create_index([("jurisdiction", 1), ("status", 1)])
+        print("✅ Created index on pending_updates (jurisdiction, status)")
+        db.pending_updates.create_index("evidence_blob")
+        print("✅ Created index on pending_updates.evidence_blob")
+        removed = remove_duplicate_pending_updates(db)
+        natural_key = [("jurisdiction", 1), ("detected_item", 1), ("new_web_val", 1), ("evidence_blob", 1)]
+        # Updates created before the evidence store have no evidence_blob; left out
+        # of the index, they are not all keyed by (item, rate) under a null blob
+        natural_key_filter = {"status": "pending", "evidence_blob": {"$type": "string"}}
+        existing = db.pending_updates.index_information().get("pending_natural_key")
+        if existing and (
+            existing["key"] != natural_key
+            or existing.get("partialFilterExpression") != natural_key_filter
+        ):
+            db.pending_updates.drop_index("pending_natural_key")
+        db.pending_updates.create_index(
+            natural_key,
+            name="pending_natural_key",
+            unique=True,
+            partialFilterExpression=natural_key_filter,
+        )
+        print(f"✅ Created unique index pending_natural_key (removed {removed} duplicate pending updates)")
+        
+        # Audit entries live in monthly audit_logs_YYYY_MM partitions, which
+        # core/audit.py indexes when it first writes to them
         
-        # audit_logs indexes
-        db.audit_logs.create_index("timestamp", direction=-1)
-        print("✅ Created index on audit_logs.timestamp")
+        
+        # crawl_pages indexes (crawl frontier)
+        db.crawl_pages.create_index("url", unique=True)
+        db.crawl_pages.create_index("source")
+        db.crawl_pages.create_index("jurisdiction")
+        print("✅ Created indexes on crawl_pages.url, crawl_pages.source, crawl_pages.jurisdiction")
         
         # users indexes
         db.users.create_index("username", unique=True)
@@ -83,6 +124,61 @@ def create_indexes(db):
         print(f"⚠️  Index creation warning: {e}")
 
 
+def migrate_jurisdictions(db):
+    """Assign records created before catalogs were partitioned by jurisdiction to the default jurisdiction"""
+    for collection in ("tax_schemes", "pending_updates", "crawl_pages"):
+        result = db[collection].update_many(
+            {"jurisdiction": {"$exists": False}},
+            {"$set": {"jurisdiction": DEFAULT_JURISDICTION}},
+        )
+        if result.modified_count:
+            print(f"✅ Assigned {result.modified_count} {collection} records to jurisdiction {DEFAULT_JURISDICTION}")
+
+
+def remove_duplicate_pending_updates(db):
+    """
+    Keep the oldest of pending updates sharing jurisdiction, item, new rate and document, so the unique index can be built.
+    Updates created before the evidence store are matched by their evidence_pdf_path instead of the blob,
+    and updates with neither are kept.
+    """
+    duplicates = db.pending_updates.aggregate([
+        {"$match": {"status": "pending"}},
+        {"$sort": {"created_at": 1}},
+        {
+            "$group": {
+                "_id": {
+                    "jurisdiction": "$jurisdiction",
+                    "item": "$detected_item",
+                    "value": "$new_web_val",
+                    "document": {"$ifNull": ["$evidence_blob", "$evidence_pdf_path"]},
+                },
+                "ids": {"$push": "$_id"},
+            }
+        },
+        {"$match": {"_id.document": {"$ne": None}, "ids.1": {"$exists": True}}},
+    ])
+    removed = 0
+    for group in duplicates:
+        removed += db.pending_updates.delete_many({"_id": {"$in": group["ids"][1:]}}).deleted_count
+    return removed
+
+
+def migrate_audit_logs():
+    """Move entries from the legacy audit_logs collection into the chained monthly partitions"""
+    migrated = migrate_legacy_audit_logs()
+    if migrated:
+        print(f"✅ Migrated {migrated} legacy audit entries into monthly partitions")
+    else:
+        print("ℹ️  No legacy audit entries to migrate")
+
+
+def migrate_audit_rollups(db):
+    """Recount per-item audit rollups keyed by item name alone into per-jurisdiction ones"""
+    if db.audit_rollup_items.count_documents({"_id": {"$type": "string"}}, limit=1):
+        rebuilt = rebuild_item_rollups()
+        print(f"✅ Rebuilt {rebuilt} per-item audit rollups by jurisdiction")
+
+
 def seed_tax_schemes(db):
     """Seed tax_schemes collection with sample data"""
     # Check if data already exists
@@ -94,36 +190,42 @@ def seed_tax_schemes(db):
     
     sample_tax_schemes = [
         {
+            "jurisdiction": DEFAULT_JURISDICTION,
             "item_name": "Mobile Phones",
             "tax_percentage": 18.0,
             "last_updated": datetime.now(),
             "description": "GST on mobile phones and accessories"
         },
         {
+            "jurisdiction": DEFAULT_JURISDICTION,
             "item_name": "Laptops",
             "tax_percentage": 18.0,
             "last_updated": datetime.now(),
             "description": "GST on computers and laptops"
         },
         {
+            "jurisdiction": DEFAULT_JURISDICTION,
             "item_name": "Tablets",
             "tax_percentage": 12.0,
             "last_updated": datetime.now(),
             "description": "GST on tablets and digital devices"
         },
         {
+            "jurisdiction": DEFAULT_JURISDICTION,
             "item_name": "Software",
             "tax_percentage": 18.0,
             "last_updated": datetime.now(),
             "description": "GST on software licenses"
         },
         {
+            "jurisdiction": DEFAULT_JURISDICTION,
             "item_name": "Cloud Services",
             "tax_percentage": 18.0,
             "last_updated": datetime.now(),
             "description": "GST on cloud computing services"
         },
         {
+            "jurisdiction": DEFAULT_JURISDICTION,
             "item_name": "Data Services",
             "tax_percentage": 18.0,
             "last_updated": datetime.now(),
@@ -182,7 +284,9 @@ def display_summary(db):
     collections = {
         "tax_schemes": db.tax_schemes.count_documents({}),
         "pending_updates": db.pending_updates.count_documents({}),
-        "audit_logs": db.audit_logs.count_documents({}),
+        "audit_logs (all partitions)": sum(
+            db[name].count_documents({}) for name in list_audit_partitions()
+        ),
         "users": db.users.count_documents({}),
     }
     
@@ -202,7 +306,7 @@ def display_summary(db):
     print("\n📋 Sample Tax Schemes:")
     schemes = db.tax_schemes.find().limit(5)
     for scheme in schemes:
-        print(f"   - {scheme['item_name']}: {scheme['tax_percentage']}%")
+        print(f"   - [{scheme.get('jurisdiction', DEFAULT_JURISDICTION)}] {scheme['item_name']}: {scheme['tax_percentage']}%")
     
     print("\n" + "="*60)
     print("✅ Database initialization complete!")
@@ -227,8 +331,11 @@ def main():
     create_collections(db)
     
     # Step 4: Create indexes
-    print("[4/5] Creating indexes...")
+    print("[4/5] Creating indexes and migrating data...")
+    migrate_jurisdictions(db)
     create_indexes(db)
+    migrate_audit_logs()
+    migrate_audit_rollups(db)
     
     # Step 5: Seed data and create admin
     print("[5/5] Seeding data and creating admin user...")
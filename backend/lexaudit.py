@@ -0,0 +1,71 @@
+"""
+LexAudit Flow - Command Line
+Offline maintenance commands for the backend.
+
+    python lexaudit.py ingest <dir>    Backfill pending updates from archived PDFs on disk.
+                                       Interrupted runs resume: documents already ingested
+                                       (or crawled) are skipped by content hash.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+
+from config import (
+    ANALYSIS_MAX_WORKERS,
+    ANALYSIS_MAX_CONCURRENT_LLM_CALLS,
+    DEFAULT_JURISDICTION,
+    INGEST_BATCH_SIZE,
+    LOG_FORMAT,
+)
+
+
+def ingest(args):
+    from agents.ingest import ingest_directory
+
+    stats = asyncio.run(ingest_directory(
+        args.directory,
+        jurisdiction=args.jurisdiction,
+        max_workers=args.workers,
+        max_llm_calls=args.llm_calls,
+        batch_size=args.batch_size,
+    ))
+    print(f"✅ Found {stats['found']} PDFs, skipped {stats['skipped']} already registered")
+    print(f"✅ Processed {stats['processed']}, created {stats['updates_created']} pending updates")
+    if stats["failed"]:
+        print(f"⚠️  {stats['failed']} documents failed and will be retried on the next run")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LexAudit Flow command line")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = commands.add_parser("ingest", help="backfill pending updates from a directory of PDFs")
+    ingest_parser.add_argument("directory", help="directory searched recursively for PDFs")
+    ingest_parser.add_argument(
+        "--jurisdiction", default=DEFAULT_JURISDICTION, help="jurisdiction whose catalog the documents amend"
+    )
+    ingest_parser.add_argument("--workers", type=int, default=ANALYSIS_MAX_WORKERS, help="processes for extraction")
+    ingest_parser.add_argument(
+        "--llm-calls", type=int, default=ANALYSIS_MAX_CONCURRENT_LLM_CALLS, help="model calls in flight"
+    )
+    ingest_parser.add_argument(
+        "--batch-size", type=int, default=INGEST_BATCH_SIZE, help="documents per bulk write and checkpoint"
+    )
+    ingest_parser.set_defaults(handler=ingest)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n⚠️  Interrupted; run the same command again to resume")
+        sys.exit(130)
+    except Exception as e:
+        print(f"\n❌ Command failed: {e}")
+        sys.exit(1)
@@ -1,24 +1,48 @@
+import asyncio
 import logging
-import os
 from pathlib import Path
-from datetime import datetime
-from fastapi import FastAPI, HTTPException, StaticFiles
-from fastapi.responses import FileResponse
+from datetime import date, datetime
+from typing import Literal, Optional
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.responses import FileResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from bson import ObjectId
 
-from core.db import init_db, seed_database, tax_schemes, pending_updates, audit_logs
-from core.models import PendingUpdate, UpdateResponse, UpdateAcceptRequest, TaxScheme
-from agents.crawler import sync_crawl_and_download
-from agents.analyzer import analyze_document
-from agents.highlighter import generate_proof
+from core.admission import rate_limit, shed_when_busy, crawl_jobs
+from core.catalog import DEFAULT_JURISDICTION, get_catalog, invalidate_catalog, jurisdiction_for_url
+from core.db import tax_schemes, pending_updates, audit_rollup_items, audit_rollup_daily
+from core.audit import AUDIT_LOG_PAGE_SIZE, AUDIT_LOG_MAX_PAGE_SIZE, record_audit, find_audit_logs, verify_chain
+from core.evidence import get_evidence_store, is_blob_key, media_type
+from core.health import (
+    REQUIRED, HEALTH_CACHE_TTL, OLLAMA_PREWARM, backend_available, check_health, start_warming, stop_warming,
+)
+from core.summary import get_summary, invalidate_summary
+from core.models import (
+    UpdateResponse, AuditLogResponse, UpdateAcceptRequest, ImpactRequest, response_projection,
+)
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize FastAPI app
-app = FastAPI(title="LexAudit Flow", version="1.0.0")
+app = FastAPI(
+    title="LexAudit Flow",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    dependencies=[Depends(rate_limit("default"))],
+)
+
+# Routes that render PDFs or scan whole collections: tighter per-client limits,
+# and shed while the crawl queue is full
+EXPENSIVE_CHECKS = (rate_limit("expensive"), shed_when_busy)
+EXPENSIVE = [Depends(check) for check in EXPENSIVE_CHECKS]
+
+
+async def admit_expensive(request: Request):
+    """Apply the EXPENSIVE checks from inside a route that is only expensive when it has to render"""
+    for check in EXPENSIVE_CHECKS:
+        await check(request)
 
 # CORS Configuration
 app.add_middleware(
@@ -29,14 +53,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize database
+# Indexes and seed data are created by the migration command (python init_database.py),
+# not on every boot, and the MongoDB connection is opened on the first query.
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup"""
-    init_db()
-    seed_database()
+    """Log application startup and start loading the model in the background"""
+    if OLLAMA_PREWARM:
+        start_warming()
     logger.info("Application started successfully")
 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    stop_warming()
+
+# Rows are projected by MongoDB into the response models' shape and serialized
+# with orjson as decoded, instead of being rebuilt per row in Python
+UPDATE_FIELDS = response_projection(UpdateResponse, evidence_page={"$add": ["$evidence_page", 1]})
+AUDIT_LOG_FIELDS = response_projection(AuditLogResponse)
+TAX_SCHEME_FIELDS = {
+    "_id": {"$toString": "$_id"}, "jurisdiction": 1, "item_name": 1, "tax_percentage": 1, "last_updated": 1,
+}
+
+
 # ==================== API Endpoints ====================
 
 @app.get("/")
@@ -45,61 +84,68 @@ async def root():
     return {"status": "ok", "message": "LexAudit Flow Backend is running"}
 
 
+@app.get("/health/live")
+async def liveness():
+    """Liveness: the API process is serving requests; backends are not probed"""
+    return {"status": "ok"}
+
+
+@app.get("/health/ready")
+async def readiness():
+    """Readiness: MongoDB ping latency, model server and model load state, last browser check; 503 only if MongoDB is down"""
+    try:
+        health = await check_health()
+        return ORJSONResponse(health, status_code=503 if health["status"] == "unavailable" else 200)
+    except Exception as e:
+        logger.error(f"Error checking health: {e}")
+        raise HTTPException(status_code=500, detail="Failed to check health")
+
+
 @app.get("/tax-schemes")
-async def get_tax_schemes():
-    """Fetch all tax schemes from the database"""
+async def get_tax_schemes(jurisdiction: Optional[str] = None):
+    """Fetch tax schemes from the database, optionally of one jurisdiction only"""
     try:
-        schemes = list(tax_schemes.find())
-        # Convert ObjectId to string for JSON serialization
-        for scheme in schemes:
-            scheme["_id"] = str(scheme["_id"])
-        return schemes
+        query = {"jurisdiction": jurisdiction} if jurisdiction else {}
+        return ORJSONResponse(list(tax_schemes.find(query, TAX_SCHEME_FIELDS)))
     except Exception as e:
         logger.error(f"Error fetching tax schemes: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch tax schemes")
 
 
-@app.get("/updates")
-async def get_pending_updates():
-    """Fetch all pending updates"""
+@app.get("/updates", response_model=list[UpdateResponse])
+async def get_pending_updates(jurisdiction: Optional[str] = None):
+    """Fetch all pending updates, optionally of one jurisdiction only"""
     try:
-        updates = list(pending_updates.find({"status": "pending"}))
-        result = []
-        for update in updates:
-            result.append({
-                "id": str(update["_id"]),
-                "detected_item": update["detected_item"],
-                "current_db_val": update["current_db_val"],
-                "new_web_val": update["new_web_val"],
-                "evidence_pdf_path": update["evidence_pdf_path"],
-                "evidence_quote": update["evidence_quote"],
-                "status": update["status"],
-                "created_at": update["created_at"].isoformat() if isinstance(update["created_at"], datetime) else update["created_at"],
-            })
-        return result
+        query = {"status": "pending"}
+        if jurisdiction:
+            query["jurisdiction"] = jurisdiction
+        return ORJSONResponse(list(pending_updates.find(query, UPDATE_FIELDS)))
     except Exception as e:
         logger.error(f"Error fetching pending updates: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch pending updates")
 
 
-@app.get("/updates/{update_id}")
+@app.get("/summary")
+async def get_dashboard_summary():
+    """Dashboard counts: pending by item, decision rates, latest change per item, crawl freshness"""
+    try:
+        return get_summary()
+    except Exception as e:
+        logger.error(f"Error computing summary: {e}")
+        raise HTTPException(status_code=500, detail="Failed to compute summary")
+
+
+@app.get("/updates/{update_id}", response_model=UpdateResponse)
 async def get_update_detail(update_id: str):
     """Get details of a specific update"""
     try:
-        update = pending_updates.find_one({"_id": ObjectId(update_id)})
+        update = pending_updates.find_one({"_id": ObjectId(update_id)}, UPDATE_FIELDS)
         if not update:
             raise HTTPException(status_code=404, detail="Update not found")
         
-        return {
-            "id": str(update["_id"]),
-            "detected_item": update["detected_item"],
-            "current_db_val": update["current_db_val"],
-            "new_web_val": update["new_web_val"],
-            "evidence_pdf_path": update["evidence_pdf_path"],
-            "evidence_quote": update["evidence_quote"],
-            "status": update["status"],
-            "created_at": update["created_at"].isoformat() if isinstance(update["created_at"], datetime) else update["created_at"],
-        }
+        return ORJSONResponse(update)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching update {update_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch update")
@@ -115,16 +161,17 @@ async def accept_update(update_id: str, request: UpdateAcceptRequest):
         
         if request.accept:
             # Update the tax_schemes collection
+            jurisdiction = update.get("jurisdiction", DEFAULT_JURISDICTION)
             item_name = update["detected_item"]
             new_value = update["new_web_val"]
             
             # Get old value before update
-            old_item = tax_schemes.find_one({"item_name": item_name})
+            old_item = tax_schemes.find_one({"jurisdiction": jurisdiction, "item_name": item_name})
             old_value = old_item["tax_percentage"] if old_item else None
             
             # Update tax scheme
             result = tax_schemes.update_one(
-                {"item_name": item_name},
+                {"jurisdiction": jurisdiction, "item_name": item_name},
                 {
                     "$set": {
                         "tax_percentage": new_value,
@@ -133,6 +180,7 @@ async def accept_update(update_id: str, request: UpdateAcceptRequest):
                 },
                 upsert=True
             )
+            invalidate_catalog()
             
             # Mark update as accepted
             pending_updates.update_one(
@@ -145,15 +193,17 @@ async def accept_update(update_id: str, request: UpdateAcceptRequest):
                 }
             )
             
-            # Log to audit_logs
-            audit_logs.insert_one({
-                "action": "update_accepted",
-                "item_name": item_name,
-                "old_value": old_value,
-                "new_value": new_value,
-                "timestamp": datetime.now(),
-            })
+            # Log to the audit log
+            record_audit(
+                action="update_accepted",
+                item_name=item_name,
+                old_value=old_value,
+                new_value=new_value,
+                evidence_blob=update.get("evidence_blob"),
+                jurisdiction=jurisdiction,
+            )
             
+            invalidate_summary()
             logger.info(f"Update {update_id} accepted: {item_name} -> {new_value}")
             return {"status": "accepted", "message": "Update accepted successfully"}
         else:
@@ -168,14 +218,16 @@ async def accept_update(update_id: str, request: UpdateAcceptRequest):
                 }
             )
             
-            audit_logs.insert_one({
-                "action": "update_rejected",
-                "item_name": update["detected_item"],
-                "old_value": update["current_db_val"],
-                "new_value": update["new_web_val"],
-                "timestamp": datetime.now(),
-            })
+            record_audit(
+                action="update_rejected",
+                item_name=update["detected_item"],
+                old_value=update["current_db_val"],
+                new_value=update["new_web_val"],
+                evidence_blob=update.get("evidence_blob"),
+                jurisdiction=update.get("jurisdiction", DEFAULT_JURISDICTION),
+            )
             
+            invalidate_summary()
             logger.info(f"Update {update_id} rejected")
             return {"status": "rejected", "message": "Update rejected"}
             
@@ -186,8 +238,13 @@ async def accept_update(update_id: str, request: UpdateAcceptRequest):
 
 @app.get("/evidence/{filename}")
 async def get_evidence_file(filename: str):
-    """Serve the highlighted PDF files"""
+    """Serve a stored source PDF by evidence key, or a legacy highlighted/raw PDF file"""
     try:
+        if is_blob_key(filename):
+            store = get_evidence_store()
+            if store.exists(filename):
+                return Response(store.get_bytes(filename), media_type=media_type(filename))
+
         file_path = Path(__file__).parent / "evidence" / "highlighted" / filename
         
         if not file_path.exists():
@@ -198,84 +255,296 @@ async def get_evidence_file(filename: str):
             raise HTTPException(status_code=404, detail="Evidence file not found")
         
         return FileResponse(file_path, media_type="application/pdf", filename=filename)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error serving evidence file {filename}: {e}")
         raise HTTPException(status_code=500, detail="Failed to serve evidence file")
 
 
-@app.post("/crawl")
-async def trigger_crawl(url: str):
+def render_update_evidence(update: dict) -> str:
+    """Render the highlighted evidence PDF of an update once and keep it in the evidence store; returns its key"""
+    from agents.highlighter import render_proof
+
+    store = get_evidence_store()
+    key = store.put_bytes(render_proof(store.get_bytes(update["evidence_blob"]), update["evidence_highlights"]))
+    pending_updates.update_one({"_id": update["_id"]}, {"$set": {"evidence_rendered": key}})
+    return key
+
+
+@app.get("/updates/{update_id}/evidence")
+async def get_update_evidence(update_id: str, request: Request):
+    """Serve the evidence PDF of an update with its quote highlighted, rendered on first request"""
+    try:
+        update = await asyncio.to_thread(pending_updates.find_one, {"_id": ObjectId(update_id)})
+        if not update:
+            raise HTTPException(status_code=404, detail="Update not found")
+
+        if not update.get("evidence_blob"):
+            # Updates created before the evidence store point at a file on disk
+            return await get_evidence_file(Path(update["evidence_pdf_path"]).name)
+
+        key = update.get("evidence_rendered") if update.get("evidence_highlights") else update["evidence_blob"]
+        if not key:
+            # Only rendering counts against the expensive tier; cached copies are plain reads
+            await admit_expensive(request)
+            key = await asyncio.to_thread(render_update_evidence, update)
+        content = await asyncio.to_thread(get_evidence_store().get_bytes, key)
+        return Response(content, media_type="application/pdf")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error rendering evidence for update {update_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to serve evidence file")
+
+
+def render_update_images(update: dict) -> dict:
+    """Render and cache the evidence images of an update that has none yet; returns the update with them"""
+    if not (update.get("evidence_blob") and update.get("evidence_highlights")):
+        raise HTTPException(status_code=404, detail="No evidence image for this update")
+
+    from agents.highlighter import cache_evidence_images
+
+    pdf_path = get_evidence_store().local_path(update["evidence_blob"])
+    images = cache_evidence_images(pdf_path, update["evidence_highlights"])
+    if not images:
+        raise HTTPException(status_code=404, detail="No evidence image for this update")
+    pending_updates.update_one({"_id": update["_id"]}, {"$set": images})
+    return {**update, **images}
+
+
+async def load_evidence_image(request: Request, update_id: str, field: str) -> Response:
+    """Serve a pre-rendered evidence image of an update, rendering and caching it if missing"""
+    update = await asyncio.to_thread(pending_updates.find_one, {"_id": ObjectId(update_id)})
+    if not update:
+        raise HTTPException(status_code=404, detail="Update not found")
+
+    if not update.get(field):
+        # Only rendering counts against the expensive tier; cached images are plain reads
+        await admit_expensive(request)
+        update = await asyncio.to_thread(render_update_images, update)
+
+    return Response(
+        await asyncio.to_thread(get_evidence_store().get_bytes, update[field]),
+        media_type="image/png",
+        headers={
+            "X-Evidence-Page": str(update["evidence_page"] + 1),
+            "Cache-Control": "max-age=86400",
+        },
+    )
+
+
+@app.get("/updates/{update_id}/snippet")
+async def get_update_snippet(update_id: str, request: Request):
+    """Serve the highlighted quote region as PNG; the 1-based page number is in X-Evidence-Page"""
+    try:
+        return await load_evidence_image(request, update_id, "evidence_snippet")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error serving snippet for update {update_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to serve evidence snippet")
+
+
+@app.get("/updates/{update_id}/thumbnail")
+async def get_update_thumbnail(update_id: str, request: Request):
+    """Serve a thumbnail of the page containing the highlighted quote as PNG"""
+    try:
+        return await load_evidence_image(request, update_id, "evidence_thumbnail")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error serving thumbnail for update {update_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to serve evidence thumbnail")
+
+
+def simulate_impact(updates: list[dict]) -> dict:
+    """Simulate applying pending updates against the current catalog rates and imported volumes"""
+    from core.impact import get_impact_engine
+
+    engine = get_impact_engine()
+    if engine is None:
+        raise HTTPException(status_code=404, detail="No transaction volumes imported")
+
+    changes = [
+        {
+            "id": str(update["_id"]),
+            "jurisdiction": update.get("jurisdiction", DEFAULT_JURISDICTION),
+            "item": update["detected_item"],
+            "new_rate": update["new_web_val"],
+        }
+        for update in updates
+    ]
+    # Rates are read from the catalogs of the jurisdictions involved only
+    current_rates = {}
+    for jurisdiction in {change["jurisdiction"] for change in changes}:
+        for item_name, rate in get_catalog(jurisdiction).items():
+            current_rates[(jurisdiction, item_name)] = rate
+    return engine.simulate(changes, current_rates)
+
+
+@app.get("/updates/{update_id}/impact", dependencies=EXPENSIVE)
+async def get_update_impact(update_id: str):
+    """Simulate the revenue and price impact of accepting an update"""
+    try:
+        update = pending_updates.find_one({"_id": ObjectId(update_id)})
+        if not update:
+            raise HTTPException(status_code=404, detail="Update not found")
+        return simulate_impact([update])
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error simulating impact of update {update_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to simulate impact")
+
+
+@app.post("/updates/impact", dependencies=EXPENSIVE)
+async def get_batch_impact(request: ImpactRequest):
+    """Simulate the combined impact of accepting several updates (all pending ones if none are given)"""
+    try:
+        if request.update_ids:
+            query = {"_id": {"$in": [ObjectId(update_id) for update_id in request.update_ids]}}
+        else:
+            query = {"status": "pending"}
+        updates = list(pending_updates.find(query).sort("created_at", 1))
+        if not updates:
+            raise HTTPException(status_code=404, detail="No updates to simulate")
+        return simulate_impact(updates)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error simulating batch impact: {e}")
+        raise HTTPException(status_code=500, detail="Failed to simulate impact")
+
+
+@app.post("/crawl", dependencies=[Depends(rate_limit("crawl"))])
+async def trigger_crawl(
+    url: str,
+    mode: Literal["auto", "static", "browser"] = "auto",
+    jurisdiction: Optional[str] = None,
+):
     """Trigger a manual crawl of a website"""
     try:
         if not url:
             raise HTTPException(status_code=400, detail="URL is required")
+        jurisdiction = jurisdiction or jurisdiction_for_url(url)
         
-        logger.info(f"Starting crawl for URL: {url}")
-        downloaded_files = sync_crawl_and_download(url)
+        # Route the job around unhealthy backends instead of running into their timeouts
+        unavailable = [backend for backend in REQUIRED if not await backend_available(backend)]
+        if mode != "static" and not await backend_available("browser"):
+            if mode == "browser":
+                unavailable.append("browser")
+            else:
+                logger.warning("Browser unavailable, crawling with static fetching only")
+                mode = "static"
+        if unavailable:
+            raise HTTPException(
+                status_code=503,
+                detail=f"Unavailable: {', '.join(unavailable)}",
+                headers={"Retry-After": str(HEALTH_CACHE_TTL)},
+            )
         
-        # Analyze each downloaded PDF
-        analysis_results = []
-        for pdf_path in downloaded_files:
-            result = analyze_document(pdf_path)
-            if result:
-                analysis_results.append({
-                    "pdf": pdf_path,
-                    "change_detected": result.change_detected,
-                    "item": result.item,
-                    "new_val": result.new_val,
-                })
-                
-                # Generate highlighted PDF if change detected
-                if result.change_detected:
-                    # Find the pending update we just created
-                    pending = pending_updates.find_one(
-                        {"detected_item": result.item, "status": "pending"},
-                        sort=[("created_at", -1)]
-                    )
-                    if pending:
-                        highlighted_path = generate_proof(
-                            pdf_path,
-                            result.quote,
-                            str(pending["_id"])
-                        )
-                        # Update the pending update with highlighted path
-                        if highlighted_path:
-                            pending_updates.update_one(
-                                {"_id": pending["_id"]},
-                                {"$set": {"evidence_pdf_path": highlighted_path}}
-                            )
+        # Agents pull in Playwright, PyMuPDF and Ollama, so load them on first crawl
+        from agents.crawler import crawl_and_download
+        from agents.pipeline import process_documents
+        
+        async with crawl_jobs.slot():
+            logger.info(f"Starting crawl for URL: {url} ({jurisdiction})")
+            # Load the model (or extend its keep-alive) while the crawl runs
+            start_warming()
+            downloaded_files = await crawl_and_download(url, mode=mode, jurisdiction=jurisdiction)
+            
+            # Analyze and highlight the downloaded PDFs concurrently, against the source's catalog
+            analysis_results = await process_documents(downloaded_files, jurisdiction=jurisdiction)
         
         return {
             "status": "completed",
+            "jurisdiction": jurisdiction,
             "downloaded_files": downloaded_files,
             "analysis_results": analysis_results,
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error during crawl: {e}")
         raise HTTPException(status_code=500, detail="Crawl failed")
 
 
-@app.get("/audit-logs")
-async def get_audit_logs():
-    """Fetch all audit logs"""
+@app.get("/audit-logs", response_model=list[AuditLogResponse])
+async def get_audit_logs(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    item_name: Optional[str] = None,
+    limit: int = Query(AUDIT_LOG_PAGE_SIZE, ge=1, le=AUDIT_LOG_MAX_PAGE_SIZE),
+    jurisdiction: Optional[str] = None,
+    before_timestamp: Optional[datetime] = None,
+    before_seq: Optional[int] = None,
+):
+    """
+    Fetch one page of audit logs, newest first, reading only the monthly partitions in range.
+    Pass the timestamp and seq of the last entry as before_timestamp/before_seq for the next page.
+    """
     try:
-        logs = list(audit_logs.find().sort("timestamp", -1))
-        result = []
-        for log in logs:
-            result.append({
-                "id": str(log["_id"]),
-                "action": log["action"],
-                "item_name": log["item_name"],
-                "old_value": log["old_value"],
-                "new_value": log["new_value"],
-                "timestamp": log["timestamp"].isoformat() if isinstance(log["timestamp"], datetime) else log["timestamp"],
-            })
-        return result
+        if (before_timestamp is None) != (before_seq is None):
+            raise HTTPException(status_code=400, detail="before_timestamp and before_seq must be given together")
+        logs = find_audit_logs(
+            since=since,
+            until=until,
+            item_name=item_name,
+            limit=limit,
+            projection=AUDIT_LOG_FIELDS,
+            jurisdiction=jurisdiction,
+            before=(before_timestamp, before_seq) if before_timestamp else None,
+        )
+        return ORJSONResponse(list(logs))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching audit logs: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch audit logs")
 
 
+@app.get("/audit-logs/rollups")
+async def get_audit_rollups(
+    group: Literal["item", "day"] = "item",
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    jurisdiction: Optional[str] = None,
+):
+    """Action counts per item (of each jurisdiction) or per day, maintained when audit entries are written"""
+    try:
+        fields = {"_id": 0, "total": 1, "actions": {"$ifNull": ["$actions", {}]}, "last_timestamp": 1}
+        if group == "item":
+            fields.update({"jurisdiction": "$_id.jurisdiction", "item": "$_id.item"})
+            query = {"_id.jurisdiction": jurisdiction} if jurisdiction else {}
+            rows = audit_rollup_items.find(query, fields).sort("_id", 1)
+        else:
+            fields["day"] = "$_id"
+            query = {}
+            if since or until:
+                query["_id"] = {}
+                if since:
+                    query["_id"]["$gte"] = since.isoformat()
+                if until:
+                    query["_id"]["$lte"] = until.isoformat()
+            rows = audit_rollup_daily.find(query, fields).sort("_id", -1)
+
+        return ORJSONResponse(list(rows))
+    except Exception as e:
+        logger.error(f"Error fetching audit rollups: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch audit rollups")
+
+
+@app.get("/audit-logs/verify", dependencies=EXPENSIVE)
+async def verify_audit_logs():
+    """Check the audit log hash chain for missing or altered entries"""
+    try:
+        return verify_chain()
+    except Exception as e:
+        logger.error(f"Error verifying audit logs: {e}")
+        raise HTTPException(status_code=500, detail="Failed to verify audit logs")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,58 @@
+import os
+import time
+
+import pytest
+
+import core.audit
+import core.db
+import core.evidence
+from core.evidence import LocalEvidenceStore, collect_garbage
+
+
+class FakeCollection:
+    """Just enough of a collection for collect_garbage: distinct with an equality filter."""
+
+    def __init__(self, docs=()):
+        self.docs = list(docs)
+
+    def distinct(self, field, query=None):
+        query = query or {}
+        return list({
+            doc[field]
+            for doc in self.docs
+            if field in doc and all(doc.get(k) == v for k, v in query.items())
+        })
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = LocalEvidenceStore(tmp_path / "blobs")
+    monkeypatch.setattr(core.evidence, "get_evidence_store", lambda: store)
+    monkeypatch.setattr(core.evidence, "EVIDENCE_DIR", tmp_path)
+    monkeypatch.setattr(core.audit, "distinct_audit_values", lambda field: set())
+    monkeypatch.setattr(core.db, "audit_logs", FakeCollection())
+    monkeypatch.setattr(core.db, "pending_updates", FakeCollection())
+    return store
+
+
+def age(store, key, hours):
+    path = store._path(key)
+    old = time.time() - hours * 3600
+    os.utime(path, (old, old))
+
+
+def test_unanalyzed_crawled_document_survives_gc(store, monkeypatch):
+    pending = store.put_bytes(b"crawled, analysis pending")
+    analyzed = store.put_bytes(b"crawled and analyzed, no change")
+    for key in (pending, analyzed):
+        age(store, key, 48)
+    monkeypatch.setattr(core.db, "crawl_pages", FakeCollection([
+        {"kind": "document", "blob": pending, "analyzed": False},
+        {"kind": "document", "blob": analyzed, "analyzed": True},
+    ]))
+
+    stats = collect_garbage(grace_hours=24)
+
+    assert store.exists(pending)
+    assert not store.exists(analyzed)
+    assert stats["blobs_kept"] == 1 and stats["blobs_removed"] == 1
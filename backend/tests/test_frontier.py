@@ -0,0 +1,10 @@
+from agents.frontier import normalize_url
+
+
+def test_normalize_url_keeps_ipv6_brackets():
+    assert normalize_url("http://[::1]:8000/x") == "http://[::1]:8000/x"
+    assert normalize_url("/y", "https://[2001:DB8::1]:443/x") == "https://[2001:db8::1]/y"
+
+
+def test_normalize_url_drops_default_port_and_fragment():
+    assert normalize_url("HTTP://Example.gov:80/a/../b#top") == "http://example.gov/b"
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from core.impact import ImpactEngine
+
+
+@pytest.fixture
+def engine():
+    # Two Laptops line items worth 1000 net, one Tablets line item worth 500 net
+    return ImpactEngine(
+        item_jurisdictions=np.array(["GST", "GST"]),
+        item_names=np.array(["Laptops", "Tablets"]),
+        item_codes=np.array([0, 0, 1], dtype=np.int32),
+        quantity=np.array([1.0, 3.0, 2.0]),
+        unit_price=np.array([400.0, 200.0, 250.0]),
+    )
+
+
+def test_rate_change_of_catalogued_item(engine):
+    result = engine.simulate(
+        [{"id": "a", "jurisdiction": "GST", "item": "Laptops", "new_rate": 12.0}],
+        {("GST", "Laptops"): 18.0},
+    )
+    impact = result["updates"][0]
+    assert impact["current_rate"] == 18.0
+    assert impact["net_sales"] == pytest.approx(1000.0)
+    assert impact["revenue_before"] == pytest.approx(180.0)
+    assert impact["revenue_after"] == pytest.approx(120.0)
+    assert impact["revenue_delta"] == pytest.approx(-60.0)
+
+
+def test_item_not_in_catalog_is_simulated_from_zero(engine):
+    result = engine.simulate(
+        [{"id": "b", "jurisdiction": "GST", "item": "Tablets", "new_rate": 12.0}],
+        {("GST", "Laptops"): 18.0},
+    )
+    impact = result["updates"][0]
+    assert impact["current_rate"] is None
+    assert impact["revenue_before"] == 0.0
+    assert impact["revenue_after"] == pytest.approx(60.0)
+    assert impact["revenue_delta"] == pytest.approx(60.0)
+    assert impact["avg_price_delta_per_unit"] == pytest.approx(30.0)
+    assert result["combined"]["revenue_delta"] == pytest.approx(60.0)
@@ -29,6 +29,16 @@ export const getPendingUpdates = async () => {
   }
 };
 
+export const getSummary = async () => {
+  try {
+    const response = await api.get('/summary');
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching summary:', error);
+    throw error;
+  }
+};
+
 export const getUpdateDetail = async (updateId) => {
   try {
     const response = await api.get(`/updates/${updateId}`);
@@ -55,6 +65,18 @@ export const getEvidenceFile = (filename) => {
   return `${API_BASE_URL}/evidence/${filename}`;
 };
 
+export const getUpdateEvidenceUrl = (updateId) => {
+  return `${API_BASE_URL}/updates/${updateId}/evidence`;
+};
+
+export const getUpdateSnippetUrl = (updateId) => {
+  return `${API_BASE_URL}/updates/${updateId}/snippet`;
+};
+
+export const getUpdateThumbnailUrl = (updateId) => {
+  return `${API_BASE_URL}/updates/${updateId}/thumbnail`;
+};
+
 export const triggerCrawl = async (url) => {
   try {
     const response = await api.post('/crawl', null, {
@@ -67,9 +89,16 @@ export const triggerCrawl = async (url) => {
   }
 };
 
-export const getAuditLogs = async () => {
+// One page of audit logs, newest first. Pass the last entry of the previous
+// page as `after` to fetch the next (older) page; an empty page means the end.
+export const getAuditLogs = async (after = null, limit = 100) => {
   try {
-    const response = await api.get('/audit-logs');
+    const params = { limit };
+    if (after) {
+      params.before_timestamp = after.timestamp;
+      params.before_seq = after.seq;
+    }
+    const response = await api.get('/audit-logs', { params });
     return response.data;
   } catch (error) {
     console.error('Error fetching audit logs:', error);
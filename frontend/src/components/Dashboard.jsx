@@ -1,6 +1,13 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { AlertCircle, CheckCircle, XCircle, Loader } from 'lucide-react';
-import { getPendingUpdates, acceptUpdate, getEvidenceFile } from '../api';
+import {
+  getPendingUpdates,
+  getSummary,
+  acceptUpdate,
+  getUpdateEvidenceUrl,
+  getUpdateSnippetUrl,
+  getUpdateThumbnailUrl,
+} from '../api';
 import PDFViewer from './PDFViewer';
 import NotificationBadge from './NotificationBadge';
 
@@ -11,15 +18,33 @@ export const Dashboard = () => {
   const [processing, setProcessing] = useState(false);
   const [notificationCount, setNotificationCount] = useState(0);
 
+  const lastSummaryKey = useRef(null);
+
   // Fetch updates on component mount
   useEffect(() => {
-    fetchUpdates();
+    pollSummary();
     
-    // Set up polling every 30 seconds
-    const interval = setInterval(fetchUpdates, 30000);
+    // Poll the small summary every 30 seconds; only refetch the full list when it changed
+    const interval = setInterval(pollSummary, 30000);
     return () => clearInterval(interval);
   }, []);
 
+  const summaryKey = (summary) =>
+    `${summary.pending_total}:${summary.latest_by_item.map(u => u.id).join(',')}`;
+
+  const pollSummary = async () => {
+    try {
+      const summary = await getSummary();
+      setNotificationCount(summary.pending_total);
+      if (summaryKey(summary) !== lastSummaryKey.current) {
+        lastSummaryKey.current = summaryKey(summary);
+        await fetchUpdates();
+      }
+    } catch (error) {
+      console.error('Failed to fetch summary:', error);
+    }
+  };
+
   const fetchUpdates = async () => {
     try {
       setLoading(true);
@@ -197,7 +222,10 @@ export const Dashboard = () => {
               </div>
 
               <PDFViewer
-                pdfPath={selectedUpdate.evidence_pdf_path}
+                pdfPath={getUpdateEvidenceUrl(selectedUpdate.id)}
+                snippetUrl={getUpdateSnippetUrl(selectedUpdate.id)}
+                thumbnailUrl={getUpdateThumbnailUrl(selectedUpdate.id)}
+                evidencePage={selectedUpdate.evidence_page}
                 onAccept={handleAccept}
                 onReject={handleReject}
                 loading={processing}
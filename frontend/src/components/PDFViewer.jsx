@@ -1,6 +1,21 @@
-import React from 'react';
+import React, { useState, useEffect } from 'react';
+
+export const PDFViewer = ({
+  pdfPath,
+  snippetUrl,
+  thumbnailUrl,
+  evidencePage,
+  onAccept,
+  onReject,
+  loading = false,
+}) => {
+  // Show the pre-rendered snippet first; the full PDF is only fetched on demand
+  const [showFullPdf, setShowFullPdf] = useState(!snippetUrl);
+
+  useEffect(() => {
+    setShowFullPdf(!snippetUrl);
+  }, [pdfPath, snippetUrl]);
 
-export const PDFViewer = ({ pdfPath, onAccept, onReject, loading = false }) => {
   if (!pdfPath) {
     return (
       <div className="h-full flex items-center justify-center bg-gray-100 rounded-lg">
@@ -12,13 +27,42 @@ export const PDFViewer = ({ pdfPath, onAccept, onReject, loading = false }) => {
   return (
     <div className="flex flex-col h-full bg-white rounded-lg shadow">
       {/* PDF Viewer */}
-      <div className="flex-1 overflow-hidden bg-gray-100 p-4">
-        <iframe
-          src={pdfPath}
-          className="w-full h-full border-0 rounded"
-          title="Evidence PDF"
-        />
-      </div>
+      {showFullPdf ? (
+        <div className="flex-1 overflow-hidden bg-gray-100 p-4">
+          <iframe
+            src={pdfPath}
+            className="w-full h-full border-0 rounded"
+            title="Evidence PDF"
+          />
+        </div>
+      ) : (
+        <div className="flex-1 overflow-y-auto bg-gray-100 p-4 flex gap-4 items-start">
+          <div className="flex-1">
+            <img
+              src={snippetUrl}
+              alt="Highlighted evidence"
+              className="w-full border border-gray-200 rounded bg-white"
+              onError={() => setShowFullPdf(true)}
+            />
+            <div className="mt-3 flex items-center justify-between text-sm text-gray-600">
+              <span>{evidencePage ? `Page ${evidencePage}` : ''}</span>
+              <button
+                onClick={() => setShowFullPdf(true)}
+                className="text-blue-600 hover:underline"
+              >
+                View full PDF
+              </button>
+            </div>
+          </div>
+          {thumbnailUrl && (
+            <img
+              src={thumbnailUrl}
+              alt="Evidence page"
+              className="w-40 border border-gray-200 rounded bg-white"
+            />
+          )}
+        </div>
+      )}
 
       {/* Action Buttons */}
       <div className="border-t border-gray-200 p-4 flex gap-4 justify-end">